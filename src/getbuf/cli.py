@@ -4,9 +4,9 @@
 # =============================================================================
 from __future__ import annotations
 
-import json
+import functools
+import os
 import sys
-from importlib.metadata import PackageNotFoundError, version as pkg_version
 from pathlib import Path
 from typing import Any, Optional
 
@@ -56,9 +56,19 @@ def _print_json_result(result: Any) -> None:
     """
     Print the GenerationResult as JSON to stdout.
 
-    We try the library's Pydantic v2 API first (model_dump_json). If not
-    available, we fall back to a plain json.dumps on __dict__ or as-is.
+    We prefer GenerationResult.to_json_bytes(), then the Pydantic v2-style
+    model_dump_json(). If neither is available, we dump to a JSON-safe dict
+    and serialize it with orjson when installed, falling back to a plain
+    json.dumps on __dict__ or as-is.
     """
+    import json
+
+    # GenerationResult can encode itself straight to bytes
+    to_json_bytes = getattr(result, "to_json_bytes", None)
+    if callable(to_json_bytes):
+        _write_json_bytes(to_json_bytes(exclude_none=True))
+        return
+
     try:
         # Pydantic v2 models
         text = result.model_dump_json(by_alias=True, exclude_none=True)  # type: ignore[attr-defined]
@@ -69,11 +79,17 @@ def _print_json_result(result: Any) -> None:
 
     try:
         # Pydantic v2 fallback: let Pydantic handle serialization
-        data = result.model_dump(by_alias=True, exclude_none=True)  # type: ignore[attr-defined]
-        print(json.dumps(data))
-        return
+        data = result.model_dump(mode="json", by_alias=True, exclude_none=True)  # type: ignore[attr-defined]
     except Exception:
         pass
+    else:
+        try:
+            import orjson  # type: ignore
+        except ImportError:
+            print(json.dumps(data))
+        else:
+            _write_json_bytes(orjson.dumps(data))
+        return
 
     # Last resorts
     try:
@@ -82,6 +98,18 @@ def _print_json_result(result: Any) -> None:
         print(json.dumps(getattr(result, "__dict__", {"result": str(result)})))
 
 
+def _write_json_bytes(payload: bytes) -> None:
+    """Write pre-encoded JSON plus a newline to stdout, skipping text encoding."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(payload.decode("utf-8"))
+        return
+
+    sys.stdout.flush()
+    buffer.write(payload + b"\n")
+    buffer.flush()
+
+
 def _buf_version() -> Optional[str]:
     """
     Best-effort detection of the buf CLI version.
@@ -103,6 +131,43 @@ def _buf_version() -> Optional[str]:
         return None
 
 
+def _get_runner(source_path: Path, buf_gen_path: Path) -> Any:
+    """
+    Return a GetBuf for the given inputs, reusing one built earlier in-process.
+
+    Paths are keyed by their realpath, so different spellings of the same
+    input share a runner, together with each file's (st_dev, st_ino,
+    st_mtime_ns): an edited or replaced buf.gen.yaml (or a changed source
+    directory) is re-parsed. For a one-shot CLI run this is a plain
+    constructor call.
+    """
+    source_str = os.path.realpath(source_path)
+    buf_gen_str = os.path.realpath(buf_gen_path)
+    return _make_runner(
+        source_str,
+        buf_gen_str,
+        _stat_identity(source_str),
+        _stat_identity(buf_gen_str),
+    )
+
+
+def _stat_identity(path: str) -> tuple[int, int, int]:
+    """Return (st_dev, st_ino, st_mtime_ns) identifying a file's version."""
+    st = os.stat(path)
+    return st.st_dev, st.st_ino, st.st_mtime_ns
+
+
+@functools.lru_cache(maxsize=8)
+def _make_runner(
+    source_str: str,
+    buf_gen_str: str,
+    source_identity: tuple[int, int, int],
+    gen_identity: tuple[int, int, int],
+) -> Any:
+    """Construct a GetBuf; the identity arguments only take part in the cache key."""
+    return GetBuf(source_dir=source_str, buf_gen_path=buf_gen_str)
+
+
 @app.command()
 def gen(
     source_dir: str = typer.Argument(
@@ -138,12 +203,8 @@ def gen(
         raise typer.Exit(code=2)
 
     try:
-        runner = GetBuf()
-        result: GenerationResult = runner.run(
-            source_dir=str(source_path),
-            buf_gen_path=str(buf_gen_path),
-            clean=clean,
-        )
+        runner = _get_runner(source_path, buf_gen_path)
+        result: GenerationResult = runner.run(clean=clean)
 
         if json_output:
             _print_json_result(result)
@@ -199,13 +260,9 @@ def clean(
         raise typer.Exit(code=2)
 
     try:
-        runner = GetBuf()
+        runner = _get_runner(source_path, buf_gen_path)
         # By contract in this step, `clean=True` means "ignore generation".
-        result: GenerationResult = runner.run(
-            source_dir=str(source_path),
-            buf_gen_path=str(buf_gen_path),
-            clean=True,
-        )
+        result: GenerationResult = runner.run(clean=True)
 
         exit_code = int(getattr(result, "exit_code", 0))
         success = bool(getattr(result, "success", True))
@@ -237,7 +294,7 @@ def fetch() -> None:
 def version_callback(
     ctx: typer.Context,
     version: bool = typer.Option(
-        False, "--version", help="Show GetBuf and tool versions"
+        False, "--version", "-V", help="Show GetBuf and tool versions"
     ),
 ) -> None:
     """Print version info."""
@@ -248,33 +305,58 @@ def version_callback(
             raise typer.Exit(code=0)
         return
 
-    # Compose a compact, helpful version report
-    lines = []
-    try:
-        lines.append(f"getbuf: {pkg_version('getbuf')}")
-    except PackageNotFoundError:
-        lines.append("getbuf: (package metadata not found)")
+    typer.echo(_version_report())
+    raise typer.Exit(code=0)
 
-    try:
-        lines.append(f"typer: {pkg_version('typer')}")
-    except PackageNotFoundError:
-        pass
 
-    try:
-        import pydantic  # type: ignore
+def _version_report() -> str:
+    """
+    Compose a compact, helpful version report.
 
-        lines.append(f"pydantic: {getattr(pydantic, '__version__', 'unknown')}")
-    except Exception:
-        pass
+    Package versions come from installed metadata and buf from a subprocess;
+    both are only touched here so that regular invocations never pay for them.
+    """
+    versions = _package_versions(("getbuf", "typer", "pydantic"))
+
+    lines = [f"getbuf: {versions.get('getbuf') or '(package metadata not found)'}"]
+    for name in ("typer", "pydantic"):
+        if versions.get(name):
+            lines.append(f"{name}: {versions[name]}")
 
     buf_ver = _buf_version()
     if buf_ver:
         lines.append(f"buf: {buf_ver}")
 
-    typer.echo("\n".join(lines))
-    raise typer.Exit(code=0)
+    return "\n".join(lines)
+
+
+def _package_versions(names: tuple[str, ...]) -> dict[str, Optional[str]]:
+    """
+    Look up installed distribution versions by name.
+
+    Targeted metadata lookups are used instead of importing the packages
+    (pydantic alone is a heavy import) or scanning every distribution.
+    """
+    from importlib import metadata
+
+    versions: dict[str, Optional[str]] = {}
+    for name in names:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def _sniff_version_flag(argv: list[str]) -> bool:
+    """Return True when the first CLI argument asks for the version report."""
+    return bool(argv) and argv[0] in {"--version", "-V"}
 
 
 def main() -> None:
     """Main entry point for console_scripts."""
+    # Fast path: answer --version before Typer builds the command parser.
+    if _sniff_version_flag(sys.argv[1:]):
+        print(_version_report())
+        sys.exit(0)
     app()
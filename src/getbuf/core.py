@@ -3,17 +3,22 @@
 
 from __future__ import annotations
 
+import io
+import logging
 import os
-import subprocess
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from subprocess import PIPE, Popen, run
+from typing import IO, Any, Callable, Dict, List, Optional
 
 from getbuf.fs import (
     clean_directory_contents,
-    compute_written_files,
     ensure_directory_exists,
-    snapshot_directory,
+    filesystem_time_ns,
+    find_files_written_since,
 )
 from getbuf.logging import logger
 from getbuf.models import (
@@ -25,6 +30,25 @@ from getbuf.models import (
 )
 from getbuf.parsing import parse_buf_gen_yaml, validate_buf_yaml
 
+# Tool versions keyed by (binary path, st_mtime_ns, st_size): repeated runs
+# skip the fork+exec, while an upgraded binary changes the key and is re-probed
+_TOOL_VERSION_CACHE: Dict[tuple[str, int, int], Optional[str]] = {}
+
+# Returned by cache-only version lookups that would need a probe
+_UNCACHED = object()
+
+# Slack subtracted from the generation start time when matching mtimes. File
+# timestamps come from the kernel's coarse clock, which lags time_ns() by at
+# most one scheduler tick (10ms at HZ=100), so a freshly written file can look
+# slightly older than the start. Kept that tight so files edited just before
+# the run are not reported as written by buf; coarser filesystems are handled
+# by sampling their own clock (see fs.filesystem_time_ns)
+MTIME_SLOP_NS = 10_000_000
+
+# Slack used when the filesystem clock can't be sampled (e.g. a read-only
+# output tree); covers the coarsest common mtime granularity (FAT, 2s)
+MTIME_FALLBACK_SLOP_NS = 2_000_000_000
+
 
 class GetBuf:
     """
@@ -69,10 +93,14 @@ class GetBuf:
             logger.error("buf.gen.yaml validation failed")
             raise
 
+        # Resolve once; downstream fs helpers are told to skip their own resolve()
+        self._out_dir_resolved = self._buf_gen_spec.out_dir.resolve()
+        self._out_dir_ensured = False
+
         logger.info(
             "GetBuf initialized successfully",
             source_dir=str(self._config.source_dir),
-            out_dir=str(self._buf_gen_spec.out_dir),
+            out_dir=str(self._out_dir_resolved),
         )
 
     def run(self, clean: bool = False) -> GenerationResult:
@@ -86,7 +114,11 @@ class GetBuf:
             GenerationResult: Complete execution results and telemetry
         """
         logger.info("Starting GetBuf run", clean=clean)
-        start_time = time.time()
+        # Monotonic clock for the duration; wall-clock jumps can't skew it
+        start_time = time.perf_counter()
+
+        # The directory may have been removed since a previous run
+        self._out_dir_ensured = False
 
         try:
             # Step 1: Validate all inputs
@@ -95,21 +127,30 @@ class GetBuf:
             # Step 2: Clean output directories if requested
             cleaned_dirs = self._clean_if_requested(clean)
 
-            # Step 3: Take snapshot before generation
-            before_snapshot = snapshot_directory(self._buf_gen_spec.out_dir)
+            # Step 3: Record when generation starts; anything buf writes has a
+            # later mtime, so no pre-generation snapshot is needed. The
+            # filesystem's own clock is sampled too, since coarse (FAT, HFS+)
+            # or skewed (NFS) mtimes can sit well before time_ns()
+            gen_start_ns = time.time_ns()
+            fs_start_ns = filesystem_time_ns(self._out_dir_resolved)
+            if fs_start_ns is None:
+                since_ns = gen_start_ns - MTIME_FALLBACK_SLOP_NS
+            else:
+                since_ns = min(gen_start_ns - MTIME_SLOP_NS, fs_start_ns)
 
             # Step 4: Execute buf generate
             command, exit_code, stdout, stderr = self._execute_buf_generate()
 
-            # Step 5: Take snapshot after generation and compute diff
-            after_snapshot = snapshot_directory(self._buf_gen_spec.out_dir)
-            written_files = compute_written_files(before_snapshot, after_snapshot)
+            # Step 5: Collect files written since generation started
+            written_files = find_files_written_since(
+                self._out_dir_resolved, since_ns, assume_resolved=True
+            )
 
             # Step 6: Gather telemetry
             buf_version, plugin_version, env_subset = self._gather_telemetry()
 
             # Calculate duration
-            duration_s = time.time() - start_time
+            duration_s = time.perf_counter() - start_time
 
             # Determine success
             success = exit_code == 0
@@ -130,7 +171,7 @@ class GetBuf:
                 duration_s=duration_s,
                 stdout=stdout,
                 stderr=stderr,
-                out_dirs=[str(self._buf_gen_spec.out_dir)],
+                out_dirs=[str(self._out_dir_resolved)],
                 cleaned_dirs=cleaned_dirs,
                 written_files=written_files,
                 buf_version=buf_version,
@@ -140,7 +181,7 @@ class GetBuf:
 
         except ValidationError as e:
             # Return failed result for validation errors
-            duration_s = time.time() - start_time
+            duration_s = time.perf_counter() - start_time
             logger.error("Validation failed", error=str(e))
 
             return GenerationResult(
@@ -151,14 +192,14 @@ class GetBuf:
                 duration_s=duration_s,
                 stdout="",
                 stderr=f"[validation] {str(e)}",
-                out_dirs=[str(self._buf_gen_spec.out_dir)],
+                out_dirs=[str(self._out_dir_resolved)],
                 cleaned_dirs=[],
                 written_files=[],
             )
 
         except ExecutionError as e:
             # Return failed result for execution errors
-            duration_s = time.time() - start_time
+            duration_s = time.perf_counter() - start_time
             logger.error("Execution failed", error=str(e))
 
             return GenerationResult(
@@ -169,14 +210,14 @@ class GetBuf:
                 duration_s=duration_s,
                 stdout="",
                 stderr=f"[execution] {str(e)}",
-                out_dirs=[str(self._buf_gen_spec.out_dir)],
+                out_dirs=[str(self._out_dir_resolved)],
                 cleaned_dirs=[],
                 written_files=[],
             )
 
         except Exception as e:
             # Unexpected errors
-            duration_s = time.time() - start_time
+            duration_s = time.perf_counter() - start_time
             logger.error("Unexpected error in GetBuf run", error=str(e))
 
             return GenerationResult(
@@ -187,7 +228,7 @@ class GetBuf:
                 duration_s=duration_s,
                 stdout="",
                 stderr=f"[unexpected] {str(e)}",
-                out_dirs=[str(self._buf_gen_spec.out_dir)],
+                out_dirs=[str(self._out_dir_resolved)],
                 cleaned_dirs=[],
                 written_files=[],
             )
@@ -227,17 +268,19 @@ class GetBuf:
             logger.debug("Cleaning not requested, skipping")
             return cleaned_dirs
 
-        logger.info("Cleaning output directory", target=str(self._buf_gen_spec.out_dir))
+        logger.info("Cleaning output directory", target=str(self._out_dir_resolved))
 
         try:
             # Ensure the output directory exists
-            ensure_directory_exists(self._buf_gen_spec.out_dir)
+            self._ensure_out_dir()
 
             # Clean the directory contents
-            clean_operation = clean_directory_contents(self._buf_gen_spec.out_dir)
+            clean_operation = clean_directory_contents(
+                self._out_dir_resolved, assume_resolved=True
+            )
 
             if clean_operation.cleaned:
-                cleaned_dirs.append(str(self._buf_gen_spec.out_dir))
+                cleaned_dirs.append(str(self._out_dir_resolved))
 
             logger.info(
                 "Directory cleaning completed",
@@ -251,6 +294,12 @@ class GetBuf:
 
         return cleaned_dirs
 
+    def _ensure_out_dir(self) -> None:
+        """Create the output directory at most once per run."""
+        if not self._out_dir_ensured:
+            ensure_directory_exists(self._out_dir_resolved, assume_resolved=True)
+            self._out_dir_ensured = True
+
     def _execute_buf_generate(self) -> tuple[List[str], int, str, str]:
         """
         Execute buf generate command with telemetry.
@@ -276,26 +325,21 @@ class GetBuf:
         )
 
         try:
-            # Ensure output directory exists before generation
-            ensure_directory_exists(self._buf_gen_spec.out_dir)
-
-            # Execute the command
-            result = subprocess.run(
-                command,
-                cwd=self._config.source_dir,
-                capture_output=True,
-                text=True,
-                check=False,  # Don't raise on non-zero exit
-            )
+            # Ensure output directory exists before generation (no-op if the
+            # clean step already did it this run)
+            self._ensure_out_dir()
+
+            # Execute the command, streaming output as it is produced
+            exit_code, stdout, stderr = self._run_streaming(command)
 
             logger.info(
                 "buf generate completed",
-                exit_code=result.returncode,
-                stdout_length=len(result.stdout),
-                stderr_length=len(result.stderr),
+                exit_code=exit_code,
+                stdout_length=len(stdout),
+                stderr_length=len(stderr),
             )
 
-            return command, result.returncode, result.stdout, result.stderr
+            return command, exit_code, stdout, stderr
 
         except FileNotFoundError as e:
             logger.error("buf binary not found", error=str(e))
@@ -307,6 +351,67 @@ class GetBuf:
             logger.error("Failed to execute buf generate", error=str(e))
             raise ExecutionError(f"Failed to execute buf generate: {e}") from e
 
+    def _run_streaming(self, command: List[str]) -> tuple[int, str, str]:
+        """
+        Run a command, draining stdout/stderr line by line on reader threads.
+
+        Both pipes are drained continuously so a chatty stderr can never fill
+        the pipe buffer and stall the child, and each line is logged live.
+        Undecodable bytes are replaced rather than failing the run. If a
+        reader fails, or the wait is interrupted, the child is killed and
+        reaped before the error propagates.
+
+        Args:
+            command: argv to execute in the source directory
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+        """
+        proc = Popen(
+            command,
+            cwd=self._config.source_dir,
+            stdout=PIPE,
+            stderr=PIPE,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+
+        stdout_buf = io.StringIO()
+        stderr_buf = io.StringIO()
+        # Reader threads record their failure here instead of dying silently
+        errors: List[BaseException] = []
+        readers = [
+            threading.Thread(
+                target=_drain_stream,
+                args=(proc.stdout, stdout_buf, "stdout", errors, proc.kill),
+                daemon=True,
+            ),
+            threading.Thread(
+                target=_drain_stream,
+                args=(proc.stderr, stderr_buf, "stderr", errors, proc.kill),
+                daemon=True,
+            ),
+        ]
+        try:
+            for reader in readers:
+                reader.start()
+            exit_code = proc.wait()
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): don't leave buf running
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                if reader.is_alive():
+                    reader.join()
+
+        if errors:
+            raise errors[0]
+
+        return exit_code, stdout_buf.getvalue(), stderr_buf.getvalue()
+
     def _gather_telemetry(self) -> tuple[Optional[str], Optional[str], Dict[str, str]]:
         """
         Gather telemetry data including versions and environment.
@@ -316,11 +421,22 @@ class GetBuf:
         """
         logger.debug("Gathering telemetry")
 
-        # Gather buf version (best effort)
-        buf_version = self._get_buf_version()
-
-        # Gather plugin version (best effort)
-        plugin_version = self._get_plugin_version()
+        # Repeated runs usually find both versions cached; only probes that
+        # miss fork, and only two misses are worth a pool to overlap them
+        buf_version = self._get_buf_version(cached_only=True)
+        plugin_version = self._get_plugin_version(cached_only=True)
+        if buf_version is _UNCACHED and plugin_version is _UNCACHED:
+            # Both are independent subprocess calls (best effort) that would
+            # otherwise run back to back
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                buf_future = executor.submit(self._get_buf_version)
+                plugin_future = executor.submit(self._get_plugin_version)
+                buf_version = buf_future.result()
+                plugin_version = plugin_future.result()
+        elif buf_version is _UNCACHED:
+            buf_version = self._get_buf_version()
+        elif plugin_version is _UNCACHED:
+            plugin_version = self._get_plugin_version()
 
         # Gather environment subset
         env_subset = self._get_env_subset()
@@ -334,44 +450,15 @@ class GetBuf:
 
         return buf_version, plugin_version, env_subset
 
-    def _get_buf_version(self) -> Optional[str]:
-        """Get buf version via best-effort subprocess call."""
-        try:
-            result = subprocess.run(
-                ["buf", "--version"],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                # Extract version from output (e.g., "1.44.0")
-                version = result.stdout.strip()
-                logger.debug("buf version detected", version=version)
-                return version
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
-            logger.debug("Failed to get buf version", error=str(e))
-
-        return None
-
-    def _get_plugin_version(self) -> Optional[str]:
-        """Get BetterProto plugin version via best-effort subprocess call."""
-        try:
-            result = subprocess.run(
-                ["protoc-gen-python_betterproto", "--version"],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.debug("plugin version detected", version=version)
-                return version
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
-            logger.debug("Failed to get plugin version", error=str(e))
+    def _get_buf_version(self, cached_only: bool = False) -> Any:
+        """Get buf version via best-effort subprocess call (cached per binary)."""
+        return _cached_tool_version("buf", "buf", cached_only=cached_only)
 
-        return None
+    def _get_plugin_version(self, cached_only: bool = False) -> Any:
+        """Get BetterProto plugin version via best-effort subprocess call (cached)."""
+        return _cached_tool_version(
+            "protoc-gen-python_betterproto", "plugin", cached_only=cached_only
+        )
 
     def _get_env_subset(self) -> Dict[str, str]:
         """Get relevant environment variables for telemetry."""
@@ -385,3 +472,88 @@ class GetBuf:
         logger.debug("Environment subset captured", keys=list(env_subset.keys()))
         return env_subset
 
+
+def _drain_stream(
+    stream: Optional[IO[str]],
+    sink: io.StringIO,
+    name: str,
+    errors: List[BaseException],
+    kill: Callable[[], None],
+) -> None:
+    """
+    Copy a process pipe into sink line by line, logging each line.
+
+    A read failure is appended to errors and the child is killed, so the
+    caller's wait() returns and can re-raise it instead of hanging on a pipe
+    nobody drains.
+    """
+    if stream is None:
+        return
+
+    # Checked once so per-line debug logs cost nothing when debug is off
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    try:
+        with stream:
+            for line in stream:
+                sink.write(line)
+                if debug:
+                    logger.debug("buf output", stream=name, line=line.rstrip("\n"))
+    except BaseException as e:
+        errors.append(e)
+        try:
+            kill()
+        except OSError:
+            pass
+
+
+def _cached_tool_version(binary: str, label: str, cached_only: bool = False) -> Any:
+    """
+    Return `<binary> --version` output, memoized by the binary's file identity.
+
+    Args:
+        binary: Executable name to resolve on PATH
+        label: Short name used in log messages
+        cached_only: Don't probe; return _UNCACHED when the cache has no entry
+
+    Returns:
+        Stripped version output, or None if unavailable (or _UNCACHED)
+    """
+    path = shutil.which(binary)
+    if path is None:
+        logger.debug(f"{label} binary not found on PATH", binary=binary)
+        return None
+
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        logger.debug(f"Failed to get {label} version", error=str(e))
+        return None
+
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key in _TOOL_VERSION_CACHE:
+        return _TOOL_VERSION_CACHE[key]
+    if cached_only:
+        return _UNCACHED
+
+    try:
+        result = run(
+            [path, "--version"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=5,
+        )
+    except Exception as e:
+        # Not cached: timeouts and spawn failures may be transient
+        logger.debug(f"Failed to get {label} version", error=str(e))
+        return None
+
+    version = None
+    if result.returncode == 0:
+        # Extract version from output (e.g., "1.44.0")
+        version = result.stdout.strip()
+        logger.debug(f"{label} version detected", version=version)
+
+    _TOOL_VERSION_CACHE[key] = version
+    return version
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import re
 import shutil
-from datetime import datetime, timezone
+import tempfile
+import time
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from getbuf.logging import logger
 from getbuf.models import CleanError, CleanOperation, FileSnapshot
@@ -17,13 +20,32 @@ IGNORE_PATTERNS = {"__pycache__", ".mypy_cache", ".pytest_cache", ".DS_Store"}
 # File extensions to ignore
 IGNORE_EXTENSIONS = {".pyc"}
 
+# Single pattern matching either an ignored path segment or extension
+_IGNORE_RE = re.compile(
+    r"(?:^|/)(?:"
+    + "|".join(re.escape(p) for p in sorted(IGNORE_PATTERNS))
+    + r")(?:/|$)|(?:"
+    + "|".join(re.escape(e) for e in sorted(IGNORE_EXTENSIONS))
+    + r")$"
+)
 
-def clean_directory_contents(target_dir: Path) -> CleanOperation:
+# Raw substrings tested before the regex; most paths contain none of them
+_IGNORE_NEEDLES = tuple(sorted(IGNORE_PATTERNS | IGNORE_EXTENSIONS))
+
+
+def clean_directory_contents(
+    target_dir: Path, detailed: bool = False, assume_resolved: bool = False
+) -> CleanOperation:
     """
     Remove contents of directory while preserving the directory itself.
 
     Args:
         target_dir: Directory whose contents should be cleaned
+        detailed: Record each removed item in files_removed. When False
+            the children are removed in place without bookkeeping; either
+            way the directory itself (and its inode) is kept.
+        assume_resolved: Skip Path.resolve() when the caller already passes
+            an absolute, resolved path
 
     Returns:
         CleanOperation: Result of the cleaning operation
@@ -34,7 +56,8 @@ def clean_directory_contents(target_dir: Path) -> CleanOperation:
     logger.debug("Starting directory clean", target_dir=str(target_dir))
 
     # Ensure target_dir is absolute
-    target_dir = target_dir.resolve()
+    if not assume_resolved:
+        target_dir = target_dir.resolve()
 
     # Handle case where directory doesn't exist
     if not target_dir.exists():
@@ -46,25 +69,36 @@ def clean_directory_contents(target_dir: Path) -> CleanOperation:
     if not target_dir.is_dir():
         raise CleanError(f"Clean target must be a directory: {target_dir}")
 
+    if not detailed:
+        return _clean_directory_fast(target_dir)
+
     files_removed = []
 
+    # Checked once so per-item debug logs cost nothing when debug is off
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     try:
-        # List all items in the directory
-        for item in target_dir.iterdir():
-            try:
-                if item.is_file():
-                    item.unlink()
-                    files_removed.append(str(item.relative_to(target_dir)))
-                    logger.debug("Removed file", file=str(item))
-                elif item.is_dir():
-                    shutil.rmtree(item)
-                    files_removed.append(str(item.relative_to(target_dir)) + "/")
-                    logger.debug("Removed directory", directory=str(item))
-            except (OSError, PermissionError) as e:
-                logger.error(
-                    "Failed to remove item during clean", item=str(item), error=str(e)
-                )
-                raise CleanError(f"Failed to remove {item}: {e}") from e
+        # Direct children only, so the relative path is just the entry name
+        with os.scandir(target_dir) as entries:
+            for item in entries:
+                try:
+                    if item.is_file():
+                        os.unlink(item.path)
+                        files_removed.append(item.name)
+                        if debug:
+                            logger.debug("Removed file", file=item.path)
+                    elif item.is_dir():
+                        shutil.rmtree(item.path)
+                        files_removed.append(item.name + "/")
+                        if debug:
+                            logger.debug("Removed directory", directory=item.path)
+                except (OSError, PermissionError) as e:
+                    logger.error(
+                        "Failed to remove item during clean",
+                        item=item.path,
+                        error=str(e),
+                    )
+                    raise CleanError(f"Failed to remove {item.path}: {e}") from e
 
         logger.info(
             "Directory contents cleaned successfully",
@@ -87,12 +121,54 @@ def clean_directory_contents(target_dir: Path) -> CleanOperation:
         raise CleanError(f"Unexpected error cleaning {target_dir}: {e}") from e
 
 
-def snapshot_directory(target_dir: Path) -> FileSnapshot:
+def _clean_directory_fast(target_dir: Path) -> CleanOperation:
+    """
+    Remove every entry inside the directory without per-item bookkeeping.
+
+    The directory itself is kept, so its inode, ownership, mode, ACLs and
+    xattrs survive and mount points or read-only parents still work.
+
+    Args:
+        target_dir: Resolved, existing directory to clean
+
+    Returns:
+        CleanOperation: Result without per-item removal details
+
+    Raises:
+        CleanError: If an entry cannot be removed
+    """
+    try:
+        with os.scandir(target_dir) as entries:
+            for item in entries:
+                # Symlinks to directories are unlinked, never followed
+                if item.is_dir(follow_symlinks=False):
+                    shutil.rmtree(item.path)
+                else:
+                    os.unlink(item.path)
+    except OSError as e:
+        logger.error(
+            "Failed to remove directory contents during clean",
+            target_dir=str(target_dir),
+            error=str(e),
+        )
+        raise CleanError(f"Failed to remove contents of {target_dir}: {e}") from e
+
+    logger.info("Directory contents cleaned successfully", target_dir=str(target_dir))
+
+    return CleanOperation(target_dir=target_dir, cleaned=True, files_removed=[])
+
+
+def snapshot_directory(target_dir: Path, assume_resolved: bool = False) -> FileSnapshot:
     """
     Create a snapshot of directory state with files and modification times.
 
+    Entries matching IGNORE_PATTERNS/IGNORE_EXTENSIONS are pruned during the
+    walk, so ignored subtrees are never descended into or stat'ed.
+
     Args:
         target_dir: Directory to snapshot
+        assume_resolved: Skip Path.resolve() when the caller already passes
+            an absolute, resolved path
 
     Returns:
         FileSnapshot: Snapshot of the directory state
@@ -100,9 +176,10 @@ def snapshot_directory(target_dir: Path) -> FileSnapshot:
     logger.debug("Creating directory snapshot", target_dir=str(target_dir))
 
     # Ensure target_dir is absolute
-    target_dir = target_dir.resolve()
+    if not assume_resolved:
+        target_dir = target_dir.resolve()
 
-    timestamp = datetime.now(timezone.utc)
+    timestamp = time.time()
     files = {}
 
     # Handle case where directory doesn't exist
@@ -117,30 +194,9 @@ def snapshot_directory(target_dir: Path) -> FileSnapshot:
         return FileSnapshot(timestamp=timestamp, files=files)
 
     try:
-        # Recursively walk the directory
-        for root, dirs, filenames in os.walk(target_dir):
-            root_path = Path(root)
-
-            # Process files
-            for filename in filenames:
-                file_path = root_path / filename
-                try:
-                    # Get relative path from target_dir
-                    relative_path = file_path.relative_to(target_dir)
-
-                    # Get modification time
-                    mtime = file_path.stat().st_mtime
-
-                    # Store with forward slashes for consistency
-                    files[str(relative_path).replace("\\", "/")] = mtime
-
-                except (OSError, ValueError) as e:
-                    logger.warning(
-                        "Failed to get file info during snapshot",
-                        file=str(file_path),
-                        error=str(e),
-                    )
-                    continue
+        for relative_path, file_stat in _iter_file_stats(target_dir):
+            # Integer nanoseconds compare exactly, unlike float st_mtime
+            files[relative_path] = file_stat.st_mtime_ns
 
         logger.info(
             "Directory snapshot created",
@@ -160,6 +216,150 @@ def snapshot_directory(target_dir: Path) -> FileSnapshot:
         return FileSnapshot(timestamp=timestamp, files={})
 
 
+def filesystem_time_ns(target_dir: Path) -> Optional[int]:
+    """
+    Return "now" as the filesystem holding target_dir records it.
+
+    Creates and removes a sentinel file and reads back its st_mtime_ns, so
+    the value carries the filesystem's own timestamp granularity (e.g. 2s on
+    FAT, 1s on HFS+/ext3) and the file server's clock on network mounts.
+    Files written afterwards never get an earlier mtime. A target_dir that
+    does not exist yet is probed through its nearest existing ancestor.
+
+    Args:
+        target_dir: Absolute directory whose filesystem clock to sample
+
+    Returns:
+        The sentinel's mtime in nanoseconds, or None if it couldn't be made
+    """
+    probe_dir = target_dir
+    while not probe_dir.is_dir() and probe_dir.parent != probe_dir:
+        probe_dir = probe_dir.parent
+
+    try:
+        fd, sentinel = tempfile.mkstemp(prefix=".getbuf-mtime-", dir=probe_dir)
+        try:
+            mtime_ns = os.fstat(fd).st_mtime_ns
+        finally:
+            os.close(fd)
+            os.unlink(sentinel)
+    except OSError as e:
+        logger.debug(
+            "Could not sample filesystem time", probe_dir=str(probe_dir), error=str(e)
+        )
+        return None
+
+    return mtime_ns
+
+
+def find_files_written_since(
+    target_dir: Path, since_ns: int, assume_resolved: bool = False
+) -> List[str]:
+    """
+    List files under a directory whose mtime is at or after a given time.
+
+    A single-walk alternative to snapshot_directory + compute_written_files
+    for callers that know when writing started. Ignore patterns are applied
+    during the walk.
+
+    Args:
+        target_dir: Directory to scan
+        since_ns: Epoch time in nanoseconds; take it from
+            filesystem_time_ns() so coarse or skewed mtimes still compare
+        assume_resolved: Skip Path.resolve() when the caller already passes
+            an absolute, resolved path
+
+    Returns:
+        Sorted relative file paths (forward slashes) written since since_ns
+    """
+    logger.debug(
+        "Finding files written since", target_dir=str(target_dir), since_ns=since_ns
+    )
+
+    # Ensure target_dir is absolute
+    if not assume_resolved:
+        target_dir = target_dir.resolve()
+
+    if not target_dir.is_dir():
+        logger.debug("Scan target is not a directory", target_dir=str(target_dir))
+        return []
+
+    try:
+        written_files = [
+            relative_path
+            for relative_path, file_stat in _iter_file_stats(target_dir)
+            if file_stat.st_mtime_ns >= since_ns
+        ]
+    except Exception as e:
+        logger.error(
+            "Failed to scan directory for written files",
+            target_dir=str(target_dir),
+            error=str(e),
+        )
+        return []
+
+    # Sort for deterministic output
+    written_files.sort()
+
+    logger.info("Computed written files", total_written=len(written_files))
+
+    return written_files
+
+
+def _iter_file_stats(target_dir: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yield (relative_path, stat_result) for every non-ignored file in a tree.
+
+    Walks with os.scandir so DirEntry caches type/stat info, and slices
+    relative paths off the base prefix without building Path objects.
+    Ignored names are pruned before any stat and symlinked directories are
+    not descended into, mirroring os.walk. Unreadable entries are skipped
+    with a warning.
+
+    Args:
+        target_dir: Resolved, existing directory to walk
+    """
+    base = os.path.join(str(target_dir), "")
+    base_len = len(base)
+    stack = [str(target_dir)]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    # Prune ignored names (e.g. __pycache__) before any stat
+                    if _should_ignore_file(entry.name):
+                        continue
+
+                    # Mirror os.walk: do not descend into symlinked dirs
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+
+                    try:
+                        file_stat = entry.stat()
+                    except OSError as e:
+                        logger.warning(
+                            "Failed to get file info during snapshot",
+                            file=entry.path,
+                            error=str(e),
+                        )
+                        continue
+
+                    # Report with forward slashes for consistency
+                    yield entry.path[base_len:].replace(os.sep, "/"), file_stat
+
+        except OSError as e:
+            logger.warning(
+                "Failed to scan directory during snapshot",
+                directory=current,
+                error=str(e),
+            )
+            continue
+
+
 def compute_written_files(before: FileSnapshot, after: FileSnapshot) -> List[str]:
     """
     Compute new or modified files between snapshots, applying ignore patterns.
@@ -177,26 +377,14 @@ def compute_written_files(before: FileSnapshot, after: FileSnapshot) -> List[str
         after_count=len(after.files),
     )
 
-    written_files = []
-
-    # Check each file in the after snapshot
-    for file_path, after_mtime in after.files.items():
-        # Skip if file matches ignore patterns
-        if _should_ignore_file(file_path):
-            logger.debug("Ignoring file due to patterns", file=file_path)
-            continue
-
-        before_mtime = before.files.get(file_path)
-
-        # File is new or modified
-        if before_mtime is None or after_mtime != before_mtime:
-            written_files.append(file_path)
-            logger.debug(
-                "File was written",
-                file=file_path,
-                before_mtime=before_mtime,
-                after_mtime=after_mtime,
-            )
+    # New files have no "before" entry, so None != mtime covers them too
+    before_files = before.files
+    written_files = [
+        file_path
+        for file_path, after_mtime in after.files.items()
+        if not _should_ignore_file(file_path)
+        and before_files.get(file_path) != after_mtime
+    ]
 
     # Sort for deterministic output
     written_files.sort()
@@ -206,12 +394,14 @@ def compute_written_files(before: FileSnapshot, after: FileSnapshot) -> List[str
     return written_files
 
 
-def ensure_directory_exists(path: Path) -> None:
+def ensure_directory_exists(path: Path, assume_resolved: bool = False) -> None:
     """
     Create directory if it doesn't exist, including parent directories.
 
     Args:
         path: Directory path to create
+        assume_resolved: Skip Path.resolve() when the caller already passes
+            an absolute, resolved path
 
     Raises:
         CleanError: If directory creation fails
@@ -219,7 +409,8 @@ def ensure_directory_exists(path: Path) -> None:
     logger.debug("Ensuring directory exists", path=str(path))
 
     # Ensure path is absolute
-    path = path.resolve()
+    if not assume_resolved:
+        path = path.resolve()
 
     if path.exists():
         if not path.is_dir():
@@ -246,16 +437,14 @@ def _should_ignore_file(file_path: str) -> bool:
     Returns:
         True if file should be ignored
     """
-    path = Path(file_path)
-
-    # Check file extension
-    if path.suffix in IGNORE_EXTENSIONS:
-        return True
-
-    # Check if any part of the path matches ignore patterns
-    for part in path.parts:
-        if part in IGNORE_PATTERNS:
-            return True
-
-    return False
-
+    # Cheap substring check first; only candidate paths pay for the regex
+    # that confirms a whole-segment or suffix match
+    for needle in _IGNORE_NEEDLES:
+        if needle in file_path:
+            break
+    else:
+        return False
+
+    # Snapshot keys are already forward-slash normalized, so one regex scan
+    # covers both the segment and the extension checks
+    return _IGNORE_RE.search(file_path) is not None
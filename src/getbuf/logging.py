@@ -5,16 +5,30 @@ from __future__ import annotations
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+try:  # Optional speedup: pip install getbuf[speedups]
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None  # type: ignore[assignment]
+
 
 class LogEntry(BaseModel):
-    """Structured log entry for JSONL output."""
+    """
+    Structured log entry for JSONL output.
+
+    Documents the schema of each JSONL line. JSONLHandler serializes a dict
+    of this shape directly rather than instantiating the model per record;
+    tests validate emitted lines against it.
+    """
     
     timestamp: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -38,55 +52,229 @@ class LogEntry(BaseModel):
         return level
 
 
+# LogRecord attributes that are never copied into a JSONL entry's context
+_LOGRECORD_STANDARD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
+    'module', 'lineno', 'funcName', 'created', 'created_ns', 'msecs',
+    'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'taskName',
+    'getMessage', 'exc_info', 'exc_text', 'stack_info', 'message', 'asctime',
+    'context', '_getbuf_context',
+})
+
+# Record attribute GetBufLogger stores its context under. Records carrying it
+# have no other extras, so emit can use it as-is without scanning __dict__.
+# The same dict is also set as record.context for user handlers and filters.
+_CONTEXT_ATTR = '_getbuf_context'
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values the JSON libraries don't handle natively."""
+    if isinstance(obj, datetime):
+        # Match pydantic's rendering of UTC datetimes
+        return obj.isoformat().replace('+00:00', 'Z')
+    return str(obj)
+
+
+# Most records share their second with the previous one, so the formatted
+# "YYYY-MM-DDTHH:MM:SS" prefix is cached as a single (second, prefix) tuple
+_iso_second_cache: tuple[int, str] = (-1, '')
+
+
+def _isoformat_ns(ns: int) -> str:
+    """Render epoch nanoseconds as ISO-8601 UTC, e.g. 2024-01-01T00:00:00.000000Z."""
+    global _iso_second_cache
+    sec, rem = divmod(ns, 1_000_000_000)
+    cached_sec, prefix = _iso_second_cache
+    if sec != cached_sec:
+        tm = time.gmtime(sec)
+        prefix = '%04d-%02d-%02dT%02d:%02d:%02d' % tm[:6]
+        _iso_second_cache = (sec, prefix)
+    return '%s.%06dZ' % (prefix, rem // 1000)
+
+
+def _record_time_ns(record: logging.LogRecord) -> int:
+    """Return when the record was created, in epoch nanoseconds."""
+    # Python 3.13+ keeps the exact integer; older versions only the float
+    created_ns = getattr(record, 'created_ns', None)
+    if created_ns is None:
+        created_ns = int(record.created * 1_000_000) * 1000
+    return created_ns
+
+
+def _dumps_line(payload: Dict[str, Any]) -> bytes:
+    """Serialize a log payload to one newline-terminated JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=_json_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_UTC_Z,
+        )
+    line = json.dumps(
+        payload, default=_json_default, ensure_ascii=False, separators=(',', ':')
+    )
+    return line.encode('utf-8') + b'\n'
+
+
+# Background writer: stop marker, the most lines joined into one write, and
+# how long close() waits for the writer to finish
+_WRITER_STOP = object()
+_MAX_BATCH = 256
+_CLOSE_TIMEOUT_S = 5
+
+
 class JSONLHandler(logging.Handler):
     """Custom logging handler that writes structured JSONL to file."""
     
-    def __init__(self, log_dir: Path):
+    def __init__(self, log_dir: Path, background: bool = False):
         """Initialize JSONL handler.
         
         Args:
             log_dir: Directory to write log files
+            background: Hand encoded lines to a writer thread that joins
+                whatever is queued into one write. Trades immediate
+                visibility (call flush()) for fewer syscalls under heavy
+                logging; off by default.
         """
         super().__init__()
         self.log_dir = log_dir
-        self.log_dir.mkdir(parents=True, exist_ok=True)
         
         # Create log file with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = log_dir / f"getbuf_{timestamp}.jsonl"
+        
+        # Raw O_APPEND descriptor, opened on first emit and kept open
+        self._fd: Optional[int] = None
+        
+        self._queue: Optional[queue.SimpleQueue[Any]] = None
+        self._writer: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(
+                target=self._drain, name="getbuf-jsonl-writer", daemon=True
+            )
+            self._writer.start()
+    
+    def _write(self, payload: bytes) -> None:
+        """Append one encoded line, opening the log file on first use."""
+        if self._fd is None:
+            # Created on first write so merely importing getbuf leaves no
+            # log directory behind
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(
+                self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+        # One write(2) per line; O_APPEND keeps lines whole even with several
+        # writers. Loop only for the rare short write (e.g. disk nearly full).
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(self._fd, view):]
     
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a log record as JSONL."""
         try:
-            # Extract context from record extras
-            context = {}
-            if hasattr(record, 'context'):
-                context.update(record.context)
-            
-            # Add any extra fields from the record
-            for key, value in record.__dict__.items():
-                if key not in {'name', 'msg', 'args', 'levelname', 'levelno', 
-                              'pathname', 'filename', 'module', 'lineno', 
-                              'funcName', 'created', 'msecs', 'relativeCreated',
-                              'thread', 'threadName', 'processName', 'process',
-                              'getMessage', 'exc_info', 'exc_text', 'stack_info',
-                              'context'}:
-                    context[key] = value
+            context = record.__dict__.get(_CONTEXT_ATTR)
+            if context is None:
+                # Foreign record: any extra fields, then the explicit context.
+                # The key-set difference runs in C; the ordered pass over the
+                # record only happens when extras are present.
+                attrs = record.__dict__
+                extra_keys = attrs.keys() - _LOGRECORD_STANDARD_ATTRS
+                context = (
+                    {k: v for k, v in attrs.items() if k in extra_keys}
+                    if extra_keys
+                    else {}
+                )
+                if hasattr(record, 'context'):
+                    context.update(record.context)
             
-            # Create structured log entry
-            log_entry = LogEntry(
-                level=record.levelname,
-                message=record.getMessage(),
-                context=context
-            )
+            # Same shape as LogEntry, serialized directly: levelname is
+            # already a valid level, so model validation would be wasted work
+            payload = {
+                'timestamp': _isoformat_ns(_record_time_ns(record)),
+                'level': record.levelname,
+                'message': record.getMessage(),
+                'context': context,
+            }
             
-            # Write JSONL line
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry.model_dump_json() + '\n')
+            # Unbuffered write on the persistent descriptor (Handler.handle
+            # already holds self.lock here): readers see each line as soon as
+            # it is logged, without an open/close per line.
+            line = _dumps_line(payload)
+            if self._queue is not None:
+                self._queue.put(line)
+            else:
+                self._write(line)
                 
         except Exception:
             # Fallback to stderr if JSONL writing fails
             sys.stderr.write(f"Logging error: {record.getMessage()}\n")
+    
+    def _drain(self) -> None:
+        """Writer thread: batch queued lines into single writes until stopped."""
+        q = self._queue
+        assert q is not None
+        while True:
+            batch: list[bytes] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            item = q.get()
+            # Coalesce whatever is already queued; no idle wait, so a lone
+            # record is written immediately
+            while True:
+                if item is _WRITER_STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                    if len(batch) >= _MAX_BATCH:
+                        break
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                try:
+                    self._write(b''.join(batch))
+                except Exception:
+                    sys.stderr.write(
+                        f"Logging error: failed to write {len(batch)} records\n"
+                    )
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+    
+    def flush(self) -> None:
+        """Wait until lines queued for the background writer are written."""
+        if self._queue is not None and self._writer is not None:
+            if self._writer.is_alive():
+                done = threading.Event()
+                self._queue.put(done)
+                done.wait(timeout=5)
+    
+    def close(self) -> None:
+        """Close the log file; logging.shutdown() calls this at exit."""
+        writer_running = False
+        if self._writer is not None and self._queue is not None:
+            if self._writer.is_alive():
+                self._queue.put(_WRITER_STOP)
+                self._writer.join(timeout=_CLOSE_TIMEOUT_S)
+            # A writer stuck in os.write past the timeout keeps the fd: closing
+            # it now could land its bytes on whatever file reuses the number
+            writer_running = self._writer.is_alive()
+            if not writer_running:
+                self._writer = None
+        with self.lock:
+            try:
+                if self._fd is not None and not writer_running:
+                    fd, self._fd = self._fd, None
+                    os.close(fd)
+            finally:
+                super().close()
 
 
 class GetBufLogger:
@@ -105,10 +293,16 @@ class GetBufLogger:
         log_dir_str = os.environ.get('GETBUF_LOG_DIR', './logs')
         log_dir = Path(log_dir_str)
         
+        # GETBUF_LOG_BACKGROUND=1 batches JSONL lines on a writer thread
+        background = os.environ.get('GETBUF_LOG_BACKGROUND', '').lower() in {
+            '1', 'true', 'yes'
+        }
+        
         # Add JSONL handler
-        jsonl_handler = JSONLHandler(log_dir)
+        jsonl_handler = JSONLHandler(log_dir, background=background)
         jsonl_handler.setLevel(logging.DEBUG)
         self._logger.addHandler(jsonl_handler)
+        self._jsonl_handler = jsonl_handler
         
         # Add console handler for immediate feedback
         console_handler = logging.StreamHandler()
@@ -119,26 +313,67 @@ class GetBufLogger:
         console_handler.setFormatter(console_formatter)
         self._logger.addHandler(console_handler)
     
+    def set_log_dir(self, log_dir: Path) -> None:
+        """
+        Redirect JSONL output to a new directory.
+        
+        The current log file is closed; the new handler keeps the same level
+        and background mode, and opens its file on the first record.
+        
+        Args:
+            log_dir: Directory to write log files
+        """
+        old_handler = self._jsonl_handler
+        new_handler = JSONLHandler(
+            Path(log_dir), background=old_handler._queue is not None
+        )
+        new_handler.setLevel(old_handler.level)
+        
+        self._logger.addHandler(new_handler)
+        self._logger.removeHandler(old_handler)
+        old_handler.close()
+        self._jsonl_handler = new_handler
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Return True if a record at this level would be processed."""
+        return self._logger.isEnabledFor(level)
+
     def debug(self, message: str, **context: Any) -> None:
         """Log debug message with optional context."""
-        self._logger.debug(message, extra={'context': context})
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(message, extra={'context': context, _CONTEXT_ATTR: context})
     
     def info(self, message: str, **context: Any) -> None:
         """Log info message with optional context."""
-        self._logger.info(message, extra={'context': context})
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(message, extra={'context': context, _CONTEXT_ATTR: context})
     
     def warning(self, message: str, **context: Any) -> None:
         """Log warning message with optional context."""
-        self._logger.warning(message, extra={'context': context})
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(message, extra={'context': context, _CONTEXT_ATTR: context})
     
     def error(self, message: str, **context: Any) -> None:
         """Log error message with optional context."""
-        self._logger.error(message, extra={'context': context})
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._logger.error(message, extra={'context': context, _CONTEXT_ATTR: context})
     
     def critical(self, message: str, **context: Any) -> None:
         """Log critical message with optional context."""
-        self._logger.critical(message, extra={'context': context})
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._logger.critical(message, extra={'context': context, _CONTEXT_ATTR: context})
+
+
+_logger_lock = threading.Lock()
 
 
-# Module-level logger instance
-logger = GetBufLogger()
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    """Create the module-level ``logger`` on first access (PEP 562)."""
+    if name == 'logger':
+        global logger
+        with _logger_lock:
+            # Another thread may have created it while we waited
+            if 'logger' not in globals():
+                logger = GetBufLogger()
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,12 +1,27 @@
-"""Pydantic models for GetBuf data structures."""
+"""Pydantic models for GetBuf data structures.
+
+Inputs that come from users (buf.gen.yaml, CLI paths) are validated Pydantic
+models. Result records built from already-validated internal data are frozen
+slotted dataclasses exposing the same model_dump/model_dump_json surface.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
+import dataclasses
+import json
+import os
+import stat
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+try:  # Optional speedup: pip install getbuf[speedups]
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None  # type: ignore[assignment]
 
 
 # =============================================================================
@@ -43,7 +58,117 @@ class CleanError(GetBufError):
 # =============================================================================
 
 
-class GenerationResult(BaseModel):
+def _to_jsonable(value: Any) -> Any:
+    """Convert a result field value into JSON-compatible primitives."""
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    return value
+
+
+def _to_jsonable_default(value: Any) -> Any:
+    """orjson ``default`` hook for the few non-native types in results."""
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _ResultRecord:
+    """
+    Pydantic-style dump helpers for the frozen result dataclasses.
+
+    Result records are only built from validated internal data, so they skip
+    model validation but keep the model_dump/model_dump_json API callers use.
+    """
+
+    __slots__ = ()
+
+    def model_dump(
+        self,
+        *,
+        mode: str = "python",
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+        by_alias: bool = False,
+        exclude_none: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Return the fields as a dict; mode="json" yields JSON primitives.
+
+        include/exclude take sets of field names. Result fields have no
+        aliases, so by_alias is accepted for pydantic parity and is a no-op.
+        """
+        data = {
+            f.name: getattr(self, f.name)
+            for f in dataclasses.fields(self)
+            if (include is None or f.name in include)
+            and (exclude is None or f.name not in exclude)
+        }
+        if exclude_none:
+            data = {k: v for k, v in data.items() if v is not None}
+        if mode == "json":
+            data = {k: self._json_field(k, v) for k, v in data.items()}
+        return data
+
+    def model_dump_json(
+        self,
+        *,
+        indent: Optional[int] = None,
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+        by_alias: bool = False,
+        exclude_none: bool = False,
+    ) -> str:
+        """Return the fields as a JSON string, compact unless indent is set."""
+        return json.dumps(
+            self.model_dump(
+                mode="json",
+                include=include,
+                exclude=exclude,
+                by_alias=by_alias,
+                exclude_none=exclude_none,
+            ),
+            ensure_ascii=False,
+            indent=indent,
+            separators=(",", ":") if indent is None else (",", ": "),
+        )
+
+    def to_json_bytes(self, *, exclude_none: bool = False) -> bytes:
+        """
+        Return the same JSON as model_dump_json(), encoded as UTF-8 bytes.
+
+        With orjson installed the dataclass is serialized natively in one
+        pass, without building the intermediate JSON-mode dict.
+        """
+        if orjson is None:
+            return self.model_dump_json(exclude_none=exclude_none).encode("utf-8")
+        if type(self)._json_field is not _ResultRecord._json_field:
+            # Custom field rendering (e.g. FileSnapshot.timestamp) has to go
+            # through the JSON-mode dict to stay byte-identical
+            return orjson.dumps(
+                self.model_dump(mode="json", exclude_none=exclude_none)
+            )
+        if not exclude_none:
+            return orjson.dumps(self, default=_to_jsonable_default)
+        data = {
+            f.name: getattr(self, f.name)
+            for f in dataclasses.fields(self)
+            if getattr(self, f.name) is not None
+        }
+        return orjson.dumps(data, default=_to_jsonable_default)
+
+    def _json_field(self, name: str, value: Any) -> Any:
+        """Render one field for JSON output; subclasses may override."""
+        return _to_jsonable(value)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class GenerationResult(_ResultRecord):
     """
     Immutable result object describing a GetBuf generation run.
 
@@ -51,36 +176,45 @@ class GenerationResult(BaseModel):
     deterministic CI/tooling pipelines.
     """
 
-    model_config = ConfigDict(frozen=True, extra="forbid")
-
-    success: bool = Field(description="True if validation passed and Buf exited 0")
-    exit_code: int = Field(description="Underlying process exit code")
-    command: List[str] = Field(description="Exact argv for Buf (reproducibility)")
-    workdir: str = Field(description="Directory where Buf was executed")
-    duration_s: float = Field(description="Wall-clock time in seconds")
-    stdout: str = Field(description="Captured standard output")
-    stderr: str = Field(
-        description="Captured standard error including validation messages"
-    )
-    logs_path: Optional[str] = Field(
-        default=None, description="Temp .log path for long output"
-    )
-    out_dirs: List[str] = Field(description="Output directories from buf.gen.yaml")
-    cleaned_dirs: List[str] = Field(
-        description="Dirs whose contents were removed via clean=True"
-    )
-    written_files: List[str] = Field(
-        description="Files added/changed in out after the run"
-    )
-    buf_version: Optional[str] = Field(
-        default=None, description="Best-effort buf --version output"
-    )
-    plugin_version: Optional[str] = Field(
-        default=None, description="Best-effort protoc-gen-python_betterproto version"
-    )
-    env_subset: Dict[str, str] = Field(
-        default_factory=dict, description="Snapshot of relevant environment variables"
-    )
+    # True if validation passed and Buf exited 0
+    success: bool
+    # Underlying process exit code
+    exit_code: int
+    # Exact argv for Buf (reproducibility)
+    command: List[str]
+    # Directory where Buf was executed
+    workdir: str
+    # Wall-clock time in seconds
+    duration_s: float
+    # Captured standard output
+    stdout: str
+    # Captured standard error including validation messages
+    stderr: str
+    # Temp .log path for long output
+    logs_path: Optional[str] = None
+    # Output directories from buf.gen.yaml
+    out_dirs: List[str]
+    # Dirs whose contents were removed via clean=True
+    cleaned_dirs: List[str]
+    # Files added/changed in out after the run
+    written_files: List[str]
+    # Best-effort buf --version output
+    buf_version: Optional[str] = None
+    # Best-effort protoc-gen-python_betterproto version
+    plugin_version: Optional[str] = None
+    # Snapshot of relevant environment variables
+    env_subset: Dict[str, str] = field(default_factory=dict)
+
+
+# Local BetterProto plugin names accepted in buf.gen.yaml
+_VALID_PLUGINS = frozenset(
+    {
+        "python_betterproto",
+        "python-betterproto",
+        "python_betterproto2",
+        "python-betterproto2",
+    }
+)
 
 
 class PluginSpec(BaseModel):
@@ -107,22 +241,17 @@ class PluginSpec(BaseModel):
     @classmethod
     def validate_betterproto(cls, v: str) -> str:
         """Ensure plugin represents local BetterProto v2."""
-        # First check for BSR/remote references
+        # Valid values pass with a single lookup
+        if v in _VALID_PLUGINS:
+            return v
+
+        # Rejected either way; only the message differs
         if "/" in v or v.startswith("buf.build"):
             raise ValueError(f"Remote/BSR plugin references not supported: {v}")
-
-        # Then check if it's a valid local BetterProto plugin
-        valid_plugins = {
-            "python_betterproto",
-            "python-betterproto",
-            "python_betterproto2",
-            "python-betterproto2",
-        }
-        if v not in valid_plugins:
-            raise ValueError(
-                f"Only local BetterProto plugins supported: {valid_plugins}, got: {v}"
-            )
-        return v
+        raise ValueError(
+            f"Only local BetterProto plugins supported: "
+            f"{', '.join(sorted(_VALID_PLUGINS))}, got: {v}"
+        )
 
 
 class BufGenSpec(BaseModel):
@@ -147,31 +276,58 @@ class BufGenSpec(BaseModel):
         return v
 
 
-class FileSnapshot(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class FileSnapshot(_ResultRecord):
     """
     Represents a snapshot of files in a directory for change detection.
 
     Maps file paths to their modification times for diff operations.
     """
 
-    model_config = ConfigDict(frozen=True, extra="forbid")
-
-    timestamp: datetime = Field(description="When this snapshot was taken")
-    files: Dict[str, float] = Field(description="Map of file path to modification time")
+    # When this snapshot was taken (epoch seconds, ISO in JSON); use
+    # taken_at for the datetime view
+    timestamp: float
+    # Map of file path to modification time (st_mtime_ns)
+    files: Dict[str, int]
+
+    def __post_init__(self) -> None:
+        """Accept datetime values (naive ones are UTC) as epoch seconds."""
+        if isinstance(self.timestamp, datetime):
+            ts = self.timestamp
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            object.__setattr__(self, "timestamp", ts.timestamp())
+
+    @property
+    def taken_at(self) -> datetime:
+        """When this snapshot was taken, as an aware UTC datetime."""
+        return datetime.fromtimestamp(self.timestamp, tz=timezone.utc)
+
+    def _json_field(self, name: str, value: Any) -> Any:
+        """Render the epoch timestamp as ISO-8601 UTC ("Z") in JSON."""
+        if name == "timestamp":
+            return (
+                datetime.fromtimestamp(value, tz=timezone.utc)
+                .isoformat()
+                .replace("+00:00", "Z")
+            )
+        return _to_jsonable(value)
 
 
-class CleanOperation(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CleanOperation(_ResultRecord):
     """
     Represents the result of a directory cleaning operation.
 
     Records what was cleaned for telemetry and verification.
     """
 
-    model_config = ConfigDict(frozen=True, extra="forbid")
-
-    target_dir: Path = Field(description="Directory that was targeted for cleaning")
-    cleaned: bool = Field(description="Whether cleaning was actually performed")
-    files_removed: List[str] = Field(description="List of files that were removed")
+    # Directory that was targeted for cleaning
+    target_dir: Path
+    # Whether cleaning was actually performed
+    cleaned: bool
+    # List of files that were removed
+    files_removed: List[str]
 
 
 class GetBufConfig(BaseModel):
@@ -194,35 +350,44 @@ class GetBufConfig(BaseModel):
         description="Whether to clean output directories before generation",
     )
 
-    @field_validator("source_dir", "buf_gen_path")
+    @model_validator(mode="before")
     @classmethod
-    def validate_path_exists(cls, v: Path) -> Path:
-        """Ensure paths exist and are normalized to absolute."""
-        if isinstance(v, str):
-            v = Path(v)
-
-        # Normalize to absolute path
-        abs_path = v.resolve()
-
-        if not abs_path.exists():
-            raise ValueError(f"Path does not exist: {abs_path}")
-
-        return abs_path
-
-    @field_validator("source_dir")
-    @classmethod
-    def validate_source_dir_has_buf_yaml(cls, v: Path) -> Path:
-        """Ensure source_dir contains buf.yaml."""
-        buf_yaml = v / "buf.yaml"
-        if not buf_yaml.exists():
-            raise ValueError(f"source_dir must contain buf.yaml: {v}")
-        return v
-
-    @field_validator("buf_gen_path")
-    @classmethod
-    def validate_buf_gen_is_file(cls, v: Path) -> Path:
-        """Ensure buf_gen_path is a file."""
-        if not v.is_file():
-            raise ValueError(f"buf_gen_path must be a file: {v}")
-        return v
+    def validate_paths(cls, data: Any) -> Any:
+        """
+        Normalize both paths to absolute and check them with one stat each.
+
+        source_dir must exist and contain buf.yaml; buf_gen_path must exist
+        and be a regular file. The existence and type checks share a single
+        os.stat result per path.
+        """
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+
+        source_dir = data.get("source_dir")
+        if isinstance(source_dir, (str, os.PathLike)):
+            source_dir = os.path.realpath(source_dir)
+            _stat_existing(source_dir)
+            try:
+                os.stat(os.path.join(source_dir, "buf.yaml"))
+            except OSError:
+                raise ValueError(f"source_dir must contain buf.yaml: {source_dir}")
+            data["source_dir"] = Path(source_dir)
+
+        buf_gen_path = data.get("buf_gen_path")
+        if isinstance(buf_gen_path, (str, os.PathLike)):
+            buf_gen_path = os.path.realpath(buf_gen_path)
+            if not stat.S_ISREG(_stat_existing(buf_gen_path).st_mode):
+                raise ValueError(f"buf_gen_path must be a file: {buf_gen_path}")
+            data["buf_gen_path"] = Path(buf_gen_path)
+
+        return data
+
+
+def _stat_existing(path: str) -> os.stat_result:
+    """Stat a path, reporting a missing path the way GetBufConfig always has."""
+    try:
+        return os.stat(path)
+    except OSError:
+        raise ValueError(f"Path does not exist: {path}")
 
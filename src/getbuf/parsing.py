@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import os
 import yaml
 from pathlib import Path
 from typing import Any, Dict
@@ -9,11 +11,53 @@ from typing import Any, Dict
 from getbuf.logging import logger
 from getbuf.models import BufGenSpec, PluginSpec, ValidationError
 
+# Prefer the libyaml-backed loader; fall back to pure Python if unavailable
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 
 def parse_buf_gen_yaml(buf_gen_path: Path, source_dir: Path) -> BufGenSpec:
     """
     Parse and validate buf.gen.yaml with GetBuf constraints.
 
+    Results are memoized per process, keyed on the file's identity
+    (path, mtime_ns, size, inode) so an edited file is always re-parsed.
+
+    Args:
+        buf_gen_path: Path to buf.gen.yaml file
+        source_dir: Source directory for resolving relative paths
+
+    Returns:
+        BufGenSpec: Validated specification
+
+    Raises:
+        ValidationError: On parsing or validation failures
+    """
+    try:
+        st = os.stat(buf_gen_path)
+    except OSError:
+        # Let the uncached path produce the proper ValidationError
+        return _parse_buf_gen_yaml_uncached(buf_gen_path, source_dir)
+
+    return _parse_buf_gen_yaml_cached(
+        str(buf_gen_path), st.st_mtime_ns, st.st_size, st.st_ino, str(source_dir)
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_buf_gen_yaml_cached(
+    buf_gen_path: str, mtime_ns: int, size: int, ino: int, source_dir: str
+) -> BufGenSpec:
+    """Memoized parse; BufGenSpec is frozen so sharing instances is safe."""
+    return _parse_buf_gen_yaml_uncached(Path(buf_gen_path), Path(source_dir))
+
+
+def _parse_buf_gen_yaml_uncached(buf_gen_path: Path, source_dir: Path) -> BufGenSpec:
+    """
+    Parse and validate buf.gen.yaml without consulting the cache.
+
     Args:
         buf_gen_path: Path to buf.gen.yaml file
         source_dir: Source directory for resolving relative paths
@@ -24,15 +68,15 @@ def parse_buf_gen_yaml(buf_gen_path: Path, source_dir: Path) -> BufGenSpec:
     Raises:
         ValidationError: On parsing or validation failures
     """
+    # Paths are passed as-is; the JSONL encoder stringifies them only when
+    # a record is actually written
     logger.debug(
-        "Parsing buf.gen.yaml",
-        buf_gen_path=str(buf_gen_path),
-        source_dir=str(source_dir),
+        "Parsing buf.gen.yaml", buf_gen_path=buf_gen_path, source_dir=source_dir
     )
 
     try:
         with open(buf_gen_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_SafeLoader)
     except FileNotFoundError:
         raise ValidationError(f"buf.gen.yaml not found: {buf_gen_path}")
     except yaml.YAMLError as e:
@@ -71,18 +115,16 @@ def parse_buf_gen_yaml(buf_gen_path: Path, source_dir: Path) -> BufGenSpec:
     if not out:
         raise ValidationError("Plugin must specify 'out' directory")
 
-    # Resolve output path relative to source directory
-    out_path = Path(out)
-    if not out_path.is_absolute():
-        out_path = (source_dir / out_path).resolve()
-    else:
-        out_path = out_path.resolve()
+    # Join relative paths onto source directory and normalize lexically
+    # (abspath applies normpath). Symlinks are resolved once, by GetBuf, for
+    # the final output directory rather than here as well.
+    out_path = Path(os.path.abspath(os.path.join(source_dir, out)))
 
     logger.info(
         "Successfully parsed buf.gen.yaml",
         plugin_kind=plugin_spec.kind,
         plugin_value=plugin_spec.value,
-        out_dir=str(out_path),
+        out_dir=out_path,
     )
 
     return BufGenSpec(version=version, plugin=plugin_spec, out_dir=out_path)
@@ -92,13 +134,34 @@ def validate_buf_yaml(buf_yaml_path: Path) -> None:
     """
     Ensure buf.yaml exists and is readable.
 
+    Successful validations are memoized by (path, mtime_ns, size, inode).
+
     Args:
         buf_yaml_path: Path to buf.yaml file
 
     Raises:
         ValidationError: If buf.yaml is missing or unreadable
     """
-    logger.debug("Validating buf.yaml", path=str(buf_yaml_path))
+    try:
+        st = os.stat(buf_yaml_path)
+    except OSError:
+        _validate_buf_yaml_uncached(buf_yaml_path)
+        return
+
+    _validate_buf_yaml_cached(str(buf_yaml_path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@functools.lru_cache(maxsize=128)
+def _validate_buf_yaml_cached(
+    buf_yaml_path: str, mtime_ns: int, size: int, ino: int
+) -> None:
+    """Memoized validation; failures raise and are therefore never cached."""
+    _validate_buf_yaml_uncached(Path(buf_yaml_path))
+
+
+def _validate_buf_yaml_uncached(buf_yaml_path: Path) -> None:
+    """Validate buf.yaml without consulting the cache."""
+    logger.debug("Validating buf.yaml", path=buf_yaml_path)
 
     if not buf_yaml_path.exists():
         raise ValidationError(f"buf.yaml not found: {buf_yaml_path}")
@@ -106,15 +169,17 @@ def validate_buf_yaml(buf_yaml_path: Path) -> None:
     if not buf_yaml_path.is_file():
         raise ValidationError(f"buf.yaml must be a file: {buf_yaml_path}")
 
+    # Only the top-level shape matters here, so compose the node tree
+    # instead of constructing Python objects for the whole document
     try:
         with open(buf_yaml_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            node = yaml.compose(f, Loader=_SafeLoader)
     except yaml.YAMLError as e:
         raise ValidationError(f"Invalid YAML in buf.yaml: {e}")
     except Exception as e:
         raise ValidationError(f"Error reading buf.yaml: {e}")
 
-    if not isinstance(data, dict):
+    if not isinstance(node, yaml.MappingNode):
         raise ValidationError("buf.yaml must contain a YAML object")
 
     logger.debug("buf.yaml validation passed")
@@ -4,9 +4,12 @@
 # =============================================================================
 from __future__ import annotations
 
+import functools
 import logging
-import re
+import shutil
+import string
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -14,8 +17,9 @@ logger = logging.getLogger(__name__)
 # Library version (bumped via release workflow)
 __version__ = "0.1.0"
 
-# A simple SemVer-ish matcher: 1.2.3, optionally with suffixes like -rc1 or +meta
-_VERSION_RE = re.compile(r"(?P<ver>\d+\.\d+\.\d+(?:[-+][A-Za-z0-9.\-_]+)?)")
+# Character classes for the SemVer-ish scanner in _find_semver
+_DIGITS = frozenset(string.digits)
+_SUFFIX_CHARS = frozenset(string.ascii_letters + string.digits + ".-_")
 
 
 def get_getbuf_version() -> str:
@@ -23,6 +27,54 @@ def get_getbuf_version() -> str:
     return __version__
 
 
+def _find_semver(text: str) -> Optional[str]:
+    """
+    Return the first SemVer-ish token in text: 1.2.3, optionally with a
+    suffix like -rc1 or +meta.
+
+    Equivalent to searching for ``\\d+\\.\\d+\\.\\d+(?:[-+][A-Za-z0-9.\\-_]+)?``
+    (ASCII digits), but done as a left-to-right scan without backtracking.
+    """
+    n = len(text)
+    i = 0
+    while i < n:
+        if text[i] not in _DIGITS:
+            i += 1
+            continue
+
+        end = _scan_numeric_core(text, i, n)
+        if end < 0:
+            # A match can't start later in this digit run either
+            while i < n and text[i] in _DIGITS:
+                i += 1
+            continue
+
+        if end < n and text[end] in "-+":
+            j = end + 1
+            while j < n and text[j] in _SUFFIX_CHARS:
+                j += 1
+            if j > end + 1:
+                end = j
+        return text[i:end]
+    return None
+
+
+def _scan_numeric_core(text: str, i: int, n: int) -> int:
+    """Match ``digits.digits.digits`` at i; return the end index or -1."""
+    for part in range(3):
+        j = i
+        while j < n and text[j] in _DIGITS:
+            j += 1
+        if j == i:
+            return -1
+        if part < 2:
+            if j >= n or text[j] != ".":
+                return -1
+            j += 1
+        i = j
+    return i
+
+
 def _run_and_parse_version(cmd: list[str], timeout: float = 2.0) -> Optional[str]:
     """
     Run a command and extract the first SemVer-ish token from its output.
@@ -49,23 +101,27 @@ def _run_and_parse_version(cmd: list[str], timeout: float = 2.0) -> Optional[str
         return None
 
     out = (proc.stdout or "") + "\n" + (proc.stderr or "")
-    match = _VERSION_RE.search(out.strip())
-    if not match:
+    ver = _find_semver(out)
+    if ver is None:
         logger.debug("No version pattern found in output for %s: %r", cmd, out)
-        return None
-    return match.group("ver")
+    return ver
 
 
+@functools.lru_cache(maxsize=1)
 def detect_buf_version() -> str | None:
-    """Best-effort `buf --version` detection."""
+    """Best-effort `buf --version` detection, cached for the process lifetime."""
     return _run_and_parse_version(["buf", "--version"])
 
 
+@functools.lru_cache(maxsize=1)
 def detect_plugin_version() -> str | None:
     """
     Best-effort detection of the BetterProto v2 plugin version.
 
-    We try a few likely binary names, returning on the first match.
+    We try a few likely binary names concurrently, so slow candidates don't
+    add up, and return the match from the earliest candidate in the list.
+    Names not found on PATH are skipped without spawning a process. Cached
+    for the process lifetime.
     """
     candidates: list[list[str]] = [
         ["protoc-gen-python_betterproto", "--version"],
@@ -73,11 +129,24 @@ def detect_plugin_version() -> str | None:
         ["python_betterproto", "--version"],
         ["python-betterproto", "--version"],
     ]
-    for cmd in candidates:
-        ver = _run_and_parse_version(cmd)
-        if ver:
-            return ver
-    return None
+    # A PATH lookup is a few stats; a failed exec still costs a fork
+    present = [cmd for cmd in candidates if shutil.which(cmd[0]) is not None]
+    if not present:
+        logger.debug("No BetterProto plugin binary found on PATH")
+        return None
+
+    executor = ThreadPoolExecutor(max_workers=len(present))
+    try:
+        futures = [executor.submit(_run_and_parse_version, cmd) for cmd in present]
+        # Check in priority order, not completion order
+        for future in futures:
+            ver = future.result()
+            if ver:
+                return ver
+        return None
+    finally:
+        # Don't wait on lower-priority probes once we have an answer
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def get_version_info() -> dict[str, str | None]:
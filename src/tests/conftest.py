@@ -0,0 +1,169 @@
+"""Shared pytest fixtures for GetBuf tests."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pyfakefs.fake_filesystem_unittest import Patcher
+
+from getbuf import parsing
+from getbuf.core import GetBuf
+from getbuf.models import BufGenSpec, GetBufConfig, PluginSpec
+
+# Minimal buf.yaml; bytes so writes skip text encoding
+_BUF_YAML = b"version: v1\n"
+
+# Valid buf.gen.yaml content as a literal; JSON flow style is also YAML, so
+# the tests never run the YAML emitter
+_BUF_GEN_YAML = (
+    '{"version": "v1", '
+    '"plugins": [{"name": "python_betterproto2", "out": "./generated"}]}'
+)
+
+
+# Memory-backed mount used for tmp_path when available
+_TMPFS_ROOT = "/dev/shm"
+
+
+def pytest_configure(config):
+    """Put tmp_path/tmp_path_factory directories on tmpfs when available."""
+    if config.option.basetemp is not None:
+        # Explicit --basetemp, or an xdist worker given one by the controller
+        return
+    if not (os.path.isdir(_TMPFS_ROOT) and os.access(_TMPFS_ROOT, os.W_OK)):
+        return
+
+    # Unique per run: pytest wipes an existing basetemp at startup
+    basetemp = tempfile.mkdtemp(prefix="getbuf-pytest-", dir=_TMPFS_ROOT)
+    config.option.basetemp = basetemp
+    config._getbuf_tmpfs_basetemp = basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs basetemp created in pytest_configure."""
+    basetemp = getattr(config, "_getbuf_tmpfs_basetemp", None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _clear_parsing_caches():
+    """Parsed buf.gen.yaml and validated buf.yaml are cached per process."""
+    parsing._parse_buf_gen_yaml_cached.cache_clear()
+    parsing._validate_buf_yaml_cached.cache_clear()
+    yield
+    parsing._parse_buf_gen_yaml_cached.cache_clear()
+    parsing._validate_buf_yaml_cached.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def source_tree(tmp_path_factory):
+    """
+    Real source directory containing buf.yaml, built once per test module.
+
+    Shared by every test in the module, so tests must not modify it; tests
+    that need a different source layout should build one under tmp_path.
+    """
+    source_dir = tmp_path_factory.mktemp("source")
+    (source_dir / "buf.yaml").write_bytes(_BUF_YAML)
+    return source_dir
+
+
+@pytest.fixture
+def fs():
+    """
+    In-memory filesystem (pyfakefs) for tests that only need files on disk.
+
+    Overrides the pyfakefs plugin fixture to leave getbuf.logging on the real
+    filesystem: the shared module logger keeps its JSONL descriptor open
+    across tests.
+    """
+    with Patcher(additional_skip_names=["getbuf.logging"]) as patcher:
+        yield patcher.fs
+
+
+@pytest.fixture
+def buf_setup(fs):
+    """
+    Create a valid source directory and buf.gen.yaml on the fake filesystem.
+
+    Returns:
+        Tuple of (source_dir, buf_gen_path)
+    """
+    source_dir = Path("/work/source")
+    buf_gen_path = Path("/work/buf.gen.yaml")
+
+    # create_file makes missing parent directories in the same call
+    fs.create_file(source_dir / "buf.yaml", contents=_BUF_YAML)
+    fs.create_file(buf_gen_path, contents=_BUF_GEN_YAML)
+
+    return source_dir, buf_gen_path
+
+
+@pytest.fixture
+def getbuf(buf_setup):
+    """
+    GetBuf instance for the valid buf_setup files, built without validation.
+
+    The state __init__ would derive from _BUF_GEN_YAML is filled in with
+    model_construct, skipping config validation and the YAML parse that
+    TestGetBufInit already exercises.
+    """
+    source_dir, buf_gen_path = buf_setup
+    out_dir = source_dir / "generated"
+
+    getbuf = GetBuf.__new__(GetBuf)
+    getbuf._config = GetBufConfig.model_construct(
+        source_dir=source_dir, buf_gen_path=buf_gen_path
+    )
+    getbuf._buf_gen_spec = BufGenSpec.model_construct(
+        version="v1",
+        plugin=PluginSpec.model_construct(kind="name", value="python_betterproto2"),
+        out_dir=out_dir,
+    )
+    getbuf._out_dir_resolved = out_dir
+    getbuf._out_dir_ensured = False
+    return getbuf
+
+
+@pytest.fixture
+def mock_popen(monkeypatch):
+    """Replace getbuf.core's own Popen name (buf generate) only."""
+    mock = MagicMock()
+    # core imports Popen by name, so the subprocess module stays untouched
+    monkeypatch.setattr("getbuf.core.Popen", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_run(monkeypatch):
+    """Replace getbuf.core's own run name (version probes) only."""
+    mock = MagicMock()
+    monkeypatch.setattr("getbuf.core.run", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_telemetry(monkeypatch):
+    """
+    Stub a GetBuf instance's version and environment probes.
+
+    Returns:
+        Callable taking (getbuf, buf_version, plugin_version, env_subset)
+    """
+
+    def _apply(getbuf, buf_version=None, plugin_version=None, env_subset=None):
+        monkeypatch.setattr(
+            getbuf, "_get_buf_version", lambda cached_only=False: buf_version
+        )
+        monkeypatch.setattr(
+            getbuf, "_get_plugin_version", lambda cached_only=False: plugin_version
+        )
+        monkeypatch.setattr(getbuf, "_get_env_subset", lambda: env_subset or {})
+
+    return _apply
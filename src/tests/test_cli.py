@@ -5,9 +5,12 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
 from pathlib import Path
 from typing import Any
 
+import pytest
 import typer
 from typer.testing import CliRunner
 
@@ -40,7 +43,7 @@ def _touch_files(tmp_path: Path) -> tuple[str, str]:
     # Create plausible paths for CLI validation
     src = tmp_path / "module"
     src.mkdir(parents=True, exist_ok=True)
-    (src / "buf.yaml").write_text("version: v1\n")
+    (src / "buf.yaml").write_bytes(b"version: v1\n")
     buf_gen = tmp_path / "buf.gen.yaml"
     buf_gen.write_text(
         "version: v1\nplugins:\n  - name: python_betterproto\n    out: gen\n"
@@ -90,6 +93,33 @@ def test_gen_json_output(monkeypatch, tmp_path: Path) -> None:
     assert payload["success"] is True
 
 
+def test_gen_json_output_without_model_dump_json(monkeypatch, tmp_path: Path) -> None:
+    source_dir, buf_gen = _touch_files(tmp_path)
+
+    import getbuf.cli as cli  # type: ignore
+
+    class DictOnlyResult:
+        success = True
+        exit_code = 0
+
+        def model_dump(self, **_: Any) -> dict[str, Any]:
+            return {"success": self.success, "exit_code": self.exit_code}
+
+    class DummyGetBuf:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def run(self, *args, **kwargs) -> DictOnlyResult:
+            return DictOnlyResult()
+
+    monkeypatch.setattr(cli, "GetBuf", DummyGetBuf, raising=True)
+
+    result = runner.invoke(app, ["gen", source_dir, buf_gen, "--json"])
+    assert result.exit_code == 0
+    payload = json.loads(result.output.strip())
+    assert payload == {"success": True, "exit_code": 0}
+
+
 def test_gen_invalid_paths(tmp_path: Path) -> None:
     # Both invalid -> should return validation exit code 2
     result = runner.invoke(
@@ -123,6 +153,54 @@ def test_clean_happy_path(monkeypatch, tmp_path: Path) -> None:
     assert dummy.called is True
 
 
+def test_runner_reused_until_buf_gen_changes(monkeypatch, tmp_path: Path) -> None:
+    source_dir, buf_gen = _touch_files(tmp_path)
+
+    import getbuf.cli as cli  # type: ignore
+
+    constructed = []
+
+    class DummyGetBuf:
+        def __init__(self, *args, **kwargs) -> None:
+            constructed.append(kwargs)
+
+        def run(self, *args, **kwargs) -> DummyResult:
+            return DummyResult(success=True, exit_code=0)
+
+    monkeypatch.setattr(cli, "GetBuf", DummyGetBuf, raising=True)
+    cli._make_runner.cache_clear()
+
+    assert runner.invoke(app, ["gen", source_dir, buf_gen]).exit_code == 0
+    assert runner.invoke(app, ["clean", source_dir, buf_gen]).exit_code == 0
+    assert constructed == [
+        {
+            "source_dir": os.path.realpath(source_dir),
+            "buf_gen_path": os.path.realpath(buf_gen),
+        }
+    ]
+
+    # A symlinked spelling of the same buf.gen.yaml shares the runner
+    alias = tmp_path / "alias.gen.yaml"
+    alias.symlink_to(buf_gen)
+    assert runner.invoke(app, ["gen", source_dir, str(alias)]).exit_code == 0
+    assert len(constructed) == 1
+
+    # Editing buf.gen.yaml bumps its mtime and forces a fresh parse
+    stat = os.stat(buf_gen)
+    os.utime(buf_gen, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert runner.invoke(app, ["gen", source_dir, buf_gen]).exit_code == 0
+    assert len(constructed) == 2
+
+    # Replacing the file with a new inode is caught even at the same mtime
+    stat = os.stat(buf_gen)
+    replacement = tmp_path / "replacement.gen.yaml"
+    replacement.write_bytes(Path(buf_gen).read_bytes())
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, buf_gen)
+    assert runner.invoke(app, ["gen", source_dir, buf_gen]).exit_code == 0
+    assert len(constructed) == 3
+
+
 def test_fetch_is_placeholder() -> None:
     result = runner.invoke(app, ["fetch"])
     # Placeholder should still be a non-zero exit
@@ -181,3 +259,16 @@ def test_getbuf_error_surface(monkeypatch, tmp_path: Path) -> None:
     assert result.exit_code == 1
     # Output can go to stderr or stdout depending on Click; use combined output
     assert "ERROR: kaboom" in result.output
+
+
+def test_main_version_fast_path(monkeypatch, capsys) -> None:
+    import getbuf.cli as cli  # type: ignore
+
+    monkeypatch.setattr(cli, "_version_report", lambda: "getbuf: 0.1.0")
+    monkeypatch.setattr(sys, "argv", ["getbuf", "-V"])
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+
+    assert exc.value.code == 0
+    assert "getbuf: 0.1.0" in capsys.readouterr().out
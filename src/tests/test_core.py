@@ -3,503 +3,513 @@
 
 from __future__ import annotations
 
+import io
+import os
 import subprocess
-import tempfile
 import time
+from collections import namedtuple
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
 import pytest
-import yaml
 
+from getbuf import core
 from getbuf.core import GetBuf
 from getbuf.models import ExecutionError, GenerationResult, ValidationError
 
+# Stand-in for subprocess.run's CompletedProcess; version probes only read
+# these three attributes
+_Completed = namedtuple("_Completed", ["returncode", "stdout", "stderr"])
+
+
+def _fake_popen(returncode: int = 0, stdout: str = "", stderr: str = "") -> MagicMock:
+    """Create a fake subprocess.Popen instance with pre-filled pipes."""
+    proc = MagicMock()
+    proc.stdout = io.StringIO(stdout)
+    proc.stderr = io.StringIO(stderr)
+    proc.wait.return_value = returncode
+    return proc
+
 
 class TestGetBufInit:
     """Test GetBuf initialization."""
 
-    def test_successful_initialization(self):
+    def test_successful_initialization(self, buf_setup):
         """Test successful GetBuf initialization with valid inputs."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create source directory with buf.yaml
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            # Create buf.gen.yaml
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
-
-            # Should initialize successfully
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            assert getbuf._config.source_dir == source_dir.resolve()
-            assert getbuf._config.buf_gen_path == buf_gen_path.resolve()
-            assert getbuf._buf_gen_spec.version == "v1"
-            assert getbuf._buf_gen_spec.plugin.value == "python_betterproto2"
-
-    def test_invalid_source_directory(self):
-        """Test initialization with invalid source directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            nonexistent_dir = Path(temp_dir) / "nonexistent"
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
-
-            with pytest.raises(ValidationError, match="Invalid configuration"):
-                GetBuf(source_dir=nonexistent_dir, buf_gen_path=buf_gen_path)
-
-    def test_missing_buf_yaml(self):
-        """Test initialization when buf.yaml is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create source directory without buf.yaml
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
-
-            with pytest.raises(ValidationError, match="Invalid configuration"):
-                GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-    def test_invalid_buf_gen_yaml(self):
-        """Test initialization with invalid buf.gen.yaml."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            # Create invalid buf.gen.yaml
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [],  # Empty plugins list
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
-
-            with pytest.raises(ValidationError):
-                GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        source_dir, buf_gen_path = buf_setup
+
+        # Should initialize successfully
+        getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+
+        assert getbuf._config.source_dir == source_dir.resolve()
+        assert getbuf._config.buf_gen_path == buf_gen_path.resolve()
+        assert getbuf._buf_gen_spec.version == "v1"
+        assert getbuf._buf_gen_spec.plugin.value == "python_betterproto2"
+
+    def test_getbuf_fixture_matches_initialization(self, buf_setup, getbuf):
+        """Test that the unvalidated getbuf fixture mirrors real __init__ state."""
+        source_dir, buf_gen_path = buf_setup
+
+        assert vars(getbuf) == vars(
+            GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        )
+
+    @pytest.mark.parametrize(
+        "broken, match",
+        [
+            ("missing_source", "Invalid configuration"),
+            ("missing_buf_yaml", "Invalid configuration"),
+            ("empty_plugins", None),
+        ],
+    )
+    def test_init_failures(self, buf_setup, broken, match):
+        """Test that invalid inputs are rejected at initialization."""
+        source_dir, buf_gen_path = buf_setup
+
+        # Break one part of the otherwise valid setup
+        if broken == "missing_source":
+            source_dir = source_dir.parent / "nonexistent"
+        elif broken == "missing_buf_yaml":
+            (source_dir / "buf.yaml").unlink()
+        else:
+            buf_gen_path.write_text("version: v1\nplugins: []\n")
+
+        with pytest.raises(ValidationError, match=match):
+            GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
 
 
 class TestGetBufRun:
     """Test GetBuf run workflow."""
 
-    def _create_test_setup(self, temp_dir: Path):
-        """Helper to create test setup with valid files."""
-        source_dir = temp_dir / "source"
-        source_dir.mkdir()
-        (source_dir / "buf.yaml").write_text("version: v1")
-
-        buf_gen_content = {
-            "version": "v1",
-            "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-        }
-        buf_gen_path = temp_dir / "buf.gen.yaml"
-        with open(buf_gen_path, "w") as f:
-            yaml.dump(buf_gen_content, f)
-
-        return source_dir, buf_gen_path
-
-    @patch("getbuf.core.subprocess.run")
-    def test_successful_run(self, mock_subprocess):
+    def test_successful_run(
+        self, mock_popen, buf_setup, getbuf, mock_telemetry, monkeypatch
+    ):
         """Test successful complete workflow."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir, buf_gen_path = self._create_test_setup(temp_path)
-
-            # Create output directory
-            output_dir = source_dir / "generated"
-            output_dir.mkdir()
-
-            # Mock subprocess.run for buf generate
-            mock_subprocess.return_value = MagicMock(
-                returncode=0, stdout="Generation successful", stderr=""
-            )
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            # Mock telemetry methods
-            with (
-                patch.object(getbuf, "_get_buf_version", return_value="1.44.0"),
-                patch.object(getbuf, "_get_plugin_version", return_value="2.0.0"),
-                patch.object(
-                    getbuf, "_get_env_subset", return_value={"BUF_CACHE": ".cache"}
-                ),
-            ):
-                result = getbuf.run(clean=False)
-
-            assert isinstance(result, GenerationResult)
-            assert result.success is True
-            assert result.exit_code == 0
-            assert result.command == [
-                "buf",
-                "generate",
-                "--template",
-                str(buf_gen_path),
-            ]
-            assert result.workdir == str(source_dir)
-            assert result.duration_s > 0
-            assert result.stdout == "Generation successful"
-            assert result.stderr == ""
-            assert result.out_dirs == [str(output_dir)]
-            assert result.cleaned_dirs == []
-            assert result.buf_version == "1.44.0"
-            assert result.plugin_version == "2.0.0"
-            assert result.env_subset == {"BUF_CACHE": ".cache"}
-
-            # Verify subprocess was called correctly
-            mock_subprocess.assert_called_once_with(
-                ["buf", "generate", "--template", str(buf_gen_path)],
-                cwd=source_dir,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-    @patch("getbuf.core.subprocess.run")
-    def test_successful_run_with_cleaning(self, mock_subprocess):
+        source_dir, buf_gen_path = buf_setup
+
+        # Freeze the run timer: one reading at start, one at the end
+        monkeypatch.setattr(core.time, "perf_counter", iter([0.0, 0.123]).__next__)
+
+        # Create output directory
+        output_dir = source_dir / "generated"
+        output_dir.mkdir()
+
+        # Mock subprocess.Popen for buf generate
+        mock_popen.return_value = _fake_popen(0, "Generation successful", "")
+
+        # Mock telemetry methods
+        mock_telemetry(getbuf, "1.44.0", "2.0.0", {"BUF_CACHE": ".cache"})
+        result = getbuf.run(clean=False)
+
+        assert isinstance(result, GenerationResult)
+        assert result.success is True
+        assert result.exit_code == 0
+        assert result.command == [
+            "buf",
+            "generate",
+            "--template",
+            str(buf_gen_path),
+        ]
+        assert result.workdir == str(source_dir)
+        assert result.duration_s == pytest.approx(0.123)
+        assert result.stdout == "Generation successful"
+        assert result.stderr == ""
+        assert result.out_dirs == [str(output_dir)]
+        assert result.cleaned_dirs == []
+        assert result.buf_version == "1.44.0"
+        assert result.plugin_version == "2.0.0"
+        assert result.env_subset == {"BUF_CACHE": ".cache"}
+
+        # Verify subprocess was called correctly
+        mock_popen.assert_called_once_with(
+            ["buf", "generate", "--template", str(buf_gen_path)],
+            cwd=source_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+
+    def test_successful_run_with_cleaning(
+        self, mock_popen, buf_setup, getbuf, mock_telemetry, fs
+    ):
         """Test successful workflow with cleaning."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir, buf_gen_path = self._create_test_setup(temp_path)
-
-            # Create output directory with existing files
-            output_dir = source_dir / "generated"
-            output_dir.mkdir()
-            (output_dir / "old_file.py").write_text("old content")
-
-            mock_subprocess.return_value = MagicMock(
-                returncode=0, stdout="Generation successful", stderr=""
+        source_dir, _ = buf_setup
+
+        # Create output directory with existing files
+        output_dir = source_dir / "generated"
+        fs.create_file(output_dir / "old_file.py", contents="old content")
+
+        mock_popen.return_value = _fake_popen(0, "Generation successful", "")
+
+        mock_telemetry(getbuf)
+        result = getbuf.run(clean=True)
+
+        assert result.success is True
+        assert result.cleaned_dirs == [str(output_dir)]
+        # Old file should be removed
+        assert not (output_dir / "old_file.py").exists()
+
+    def test_clean_run_ensures_output_dir_once(
+        self, mock_popen, getbuf, mock_telemetry
+    ):
+        """Test that generation reuses the directory check from the clean step."""
+        # Fresh pipes per run; the drained ones are closed
+        mock_popen.side_effect = lambda *a, **kw: _fake_popen(0, "", "")
+
+        mock_telemetry(getbuf)
+        with patch(
+            "getbuf.core.ensure_directory_exists",
+            wraps=core.ensure_directory_exists,
+        ) as mock_ensure:
+            getbuf.run(clean=True)
+            getbuf.run(clean=True)
+
+        # Once per run, not once per step
+        assert mock_ensure.call_count == 2
+
+    def test_run_reports_files_written_during_generation(
+        self, mock_popen, buf_setup, getbuf, mock_telemetry, fs
+    ):
+        """Test that only files written after generation starts are reported."""
+        source_dir, _ = buf_setup
+
+        output_dir = source_dir / "generated"
+        old_file = output_dir / "old_file.py"
+        fs.create_file(old_file, contents="old content")
+        old_mtime = time.time() - 3600
+        os.utime(old_file, (old_mtime, old_mtime))
+
+        def fake_generate(*args, **kwargs):
+            (output_dir / "pkg").mkdir()
+            (output_dir / "pkg" / "new_file.py").write_text("new content")
+            return _fake_popen(0, "", "")
+
+        mock_popen.side_effect = fake_generate
+
+        mock_telemetry(getbuf)
+        result = getbuf.run(clean=False)
+
+        assert result.success is True
+        assert result.written_files == ["pkg/new_file.py"]
+
+    def test_run_ignores_files_modified_just_before_generation(
+        self, mock_popen, buf_setup, getbuf, mock_telemetry, fs
+    ):
+        """Test that a file edited shortly before the run is not reported."""
+        source_dir, _ = buf_setup
+
+        output_dir = source_dir / "generated"
+        recent_file = output_dir / "recent_file.py"
+        fs.create_file(recent_file, contents="edited by hand")
+        recent_mtime = time.time() - 0.5
+        os.utime(recent_file, (recent_mtime, recent_mtime))
+
+        def fake_generate(*args, **kwargs):
+            (output_dir / "new_file.py").write_text("new content")
+            return _fake_popen(0, "", "")
+
+        mock_popen.side_effect = fake_generate
+
+        mock_telemetry(getbuf)
+        result = getbuf.run(clean=False)
+
+        assert result.written_files == ["new_file.py"]
+
+    def test_run_reports_files_on_coarse_mtime_filesystem(
+        self, mock_popen, buf_setup, getbuf, mock_telemetry, fs, monkeypatch
+    ):
+        """Test that files written with 2s-truncated mtimes (FAT) are reported."""
+        source_dir, _ = buf_setup
+
+        output_dir = source_dir / "generated"
+        fs.create_dir(output_dir)
+        # pyfakefs stamps mtimes from time.time(); truncate them like FAT does
+        # while time.time_ns() keeps full precision
+        coarse_now = (time.time() // 2) * 2
+        monkeypatch.setattr(time, "time", lambda: coarse_now)
+
+        def fake_generate(*args, **kwargs):
+            new_file = output_dir / "new_file.py"
+            new_file.write_text("new content")
+            os.utime(new_file, (coarse_now, coarse_now))
+            return _fake_popen(0, "", "")
+
+        mock_popen.side_effect = fake_generate
+
+        mock_telemetry(getbuf)
+        result = getbuf.run(clean=False)
+
+        assert result.written_files == ["new_file.py"]
+        # The sentinel used to sample the filesystem clock is removed again
+        assert os.listdir(output_dir) == ["new_file.py"]
+
+    @pytest.mark.parametrize(
+        "popen_error, expected_exit, expected_stderr",
+        [
+            (None, 1, "buf: error parsing proto files"),
+            (
+                FileNotFoundError("buf not found"),
+                127,
+                "[execution] buf binary not found on PATH. "
+                "Please ensure buf is installed.",
+            ),
+        ],
+        ids=["generation_failure", "binary_not_found"],
+    )
+    def test_buf_failure_reported_in_result(
+        self,
+        mock_popen,
+        getbuf,
+        mock_telemetry,
+        popen_error,
+        expected_exit,
+        expected_stderr,
+    ):
+        """Test that a failing or missing buf binary yields a failed result."""
+        if popen_error is None:
+            mock_popen.return_value = _fake_popen(
+                1, "", "buf: error parsing proto files"
             )
+        else:
+            mock_popen.side_effect = popen_error
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            with (
-                patch.object(getbuf, "_get_buf_version", return_value=None),
-                patch.object(getbuf, "_get_plugin_version", return_value=None),
-                patch.object(getbuf, "_get_env_subset", return_value={}),
-            ):
-                result = getbuf.run(clean=True)
-
-            assert result.success is True
-            assert result.cleaned_dirs == [str(output_dir)]
-            # Old file should be removed
-            assert not (output_dir / "old_file.py").exists()
-
-    @patch("getbuf.core.subprocess.run")
-    def test_buf_generation_failure(self, mock_subprocess):
-        """Test handling of buf generate failure."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir, buf_gen_path = self._create_test_setup(temp_path)
-
-            # Mock failed subprocess
-            mock_subprocess.return_value = MagicMock(
-                returncode=1, stdout="", stderr="buf: error parsing proto files"
-            )
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            with (
-                patch.object(getbuf, "_get_buf_version", return_value=None),
-                patch.object(getbuf, "_get_plugin_version", return_value=None),
-                patch.object(getbuf, "_get_env_subset", return_value={}),
-            ):
-                result = getbuf.run()
-
-            assert result.success is False
-            assert result.exit_code == 1
-            assert result.stderr == "buf: error parsing proto files"
+        mock_telemetry(getbuf)
+        result = getbuf.run()
 
-    @patch("getbuf.core.subprocess.run")
-    def test_buf_binary_not_found(self, mock_subprocess):
-        """Test handling when buf binary is not found."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir, buf_gen_path = self._create_test_setup(temp_path)
-
-            # Mock FileNotFoundError for missing buf binary
-            mock_subprocess.side_effect = FileNotFoundError("buf not found")
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-            result = getbuf.run()
+        assert result.success is False
+        assert result.exit_code == expected_exit
+        assert result.stderr == expected_stderr
 
-            assert result.success is False
-            assert result.exit_code == 127
-            assert "buf binary not found" in result.stderr
-
-    def test_validation_error_handling(self):
+    def test_validation_error_handling(self, getbuf):
         """Test handling of validation errors during run."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir, buf_gen_path = self._create_test_setup(temp_path)
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            # Mock validation to fail
-            with patch.object(
-                getbuf,
-                "_validate_inputs",
-                side_effect=ValidationError("Test validation error"),
-            ):
-                result = getbuf.run()
+        # Mock validation to fail
+        with patch.object(
+            getbuf,
+            "_validate_inputs",
+            side_effect=ValidationError("Test validation error"),
+        ):
+            result = getbuf.run()
 
-            assert result.success is False
-            assert result.exit_code == 2
-            assert "[validation] Test validation error" in result.stderr
+        assert result.success is False
+        assert result.exit_code == 2
+        assert "[validation] Test validation error" in result.stderr
 
 
 class TestGetBufValidation:
     """Test GetBuf validation methods."""
 
-    def test_validate_inputs_success(self):
+    def test_validate_inputs_success(self, getbuf):
         """Test successful input validation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        # Should not raise
+        getbuf._validate_inputs()
 
-            # Should not raise
-            getbuf._validate_inputs()
-
-    def test_validate_inputs_missing_buf_yaml(self):
+    def test_validate_inputs_missing_buf_yaml(self, buf_setup, getbuf):
         """Test validation failure when buf.yaml is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-
-            # Create buf.yaml first, then remove it to simulate missing file
-            buf_yaml = source_dir / "buf.yaml"
-            buf_yaml.write_text("version: v1")
+        source_dir, _ = buf_setup
 
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
+        # Remove buf.yaml after initialization to test validation
+        (source_dir / "buf.yaml").unlink()
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            # Remove buf.yaml after initialization to test validation
-            buf_yaml.unlink()
-
-            with pytest.raises(ValidationError):
-                getbuf._validate_inputs()
+        with pytest.raises(ValidationError):
+            getbuf._validate_inputs()
 
 
 class TestGetBufCleaning:
     """Test GetBuf cleaning functionality."""
 
-    def test_clean_if_requested_skip_when_false(self):
+    def test_clean_if_requested_skip_when_false(self, getbuf):
         """Test that cleaning is skipped when clean=False."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
+        cleaned_dirs = getbuf._clean_if_requested(clean=False)
 
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
+        assert cleaned_dirs == []
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            cleaned_dirs = getbuf._clean_if_requested(clean=False)
-
-            assert cleaned_dirs == []
-
-    def test_clean_if_requested_performs_cleaning(self):
+    def test_clean_if_requested_performs_cleaning(self, buf_setup, getbuf, fs):
         """Test that cleaning is performed when clean=True."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
+        source_dir, _ = buf_setup
 
-            # Create output directory with files
-            output_dir = source_dir / "generated"
-            output_dir.mkdir()
-            (output_dir / "old_file.py").write_text("old content")
+        # Create output directory with files
+        output_dir = source_dir / "generated"
+        fs.create_file(output_dir / "old_file.py", contents="old content")
 
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
+        cleaned_dirs = getbuf._clean_if_requested(clean=True)
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            cleaned_dirs = getbuf._clean_if_requested(clean=True)
-
-            assert cleaned_dirs == [str(output_dir)]
-            assert not (output_dir / "old_file.py").exists()
-            assert output_dir.exists()  # Directory itself should remain
+        assert cleaned_dirs == [str(output_dir)]
+        assert not (output_dir / "old_file.py").exists()
+        assert output_dir.exists()  # Directory itself should remain
 
 
 class TestGetBufExecution:
     """Test GetBuf subprocess execution."""
 
-    @patch("getbuf.core.subprocess.run")
-    def test_execute_buf_generate_success(self, mock_subprocess):
+    def test_execute_buf_generate_success(self, mock_popen, buf_setup, getbuf):
         """Test successful buf generate execution."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
-
-            mock_subprocess.return_value = MagicMock(
-                returncode=0, stdout="Generated successfully", stderr=""
-            )
+        source_dir, buf_gen_path = buf_setup
+
+        mock_popen.return_value = _fake_popen(0, "Generated successfully", "")
+
+        command, exit_code, stdout, stderr = getbuf._execute_buf_generate()
+
+        assert command == ["buf", "generate", "--template", str(buf_gen_path)]
+        assert exit_code == 0
+        assert stdout == "Generated successfully"
+        assert stderr == ""
+
+        mock_popen.assert_called_once_with(
+            ["buf", "generate", "--template", str(buf_gen_path)],
+            cwd=source_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+
+    def test_mock_popen_leaves_subprocess_module_alone(self, mock_popen, mock_run):
+        """Test that the fixtures patch core's names, not the global module."""
+        assert core.Popen is mock_popen
+        assert core.run is mock_run
+        assert subprocess.Popen is not mock_popen
+        assert subprocess.run is not mock_run
+
+    def test_execute_buf_generate_reader_error(self, mock_popen, buf_setup, getbuf):
+        """Test that a failing pipe reader kills buf and raises ExecutionError."""
+        proc = _fake_popen(0, "", "")
+        proc.stdout = MagicMock()
+        proc.stdout.__iter__.side_effect = OSError("pipe broke")
+        mock_popen.return_value = proc
+
+        with pytest.raises(ExecutionError, match="pipe broke"):
+            getbuf._execute_buf_generate()
+
+        proc.kill.assert_called()
+
+    def test_execute_buf_generate_interrupted(self, mock_popen, buf_setup, getbuf):
+        """Test that an interrupted wait kills and reaps buf before re-raising."""
+        proc = _fake_popen(0, "", "")
+        proc.wait.side_effect = [KeyboardInterrupt, -9]
+        mock_popen.return_value = proc
+
+        with pytest.raises(KeyboardInterrupt):
+            getbuf._execute_buf_generate()
+
+        proc.kill.assert_called_once_with()
+        assert proc.wait.call_count == 2
+
+    def test_execute_buf_generate_not_found(self, mock_popen, getbuf):
+        """Test handling when buf binary is not found."""
+        mock_popen.side_effect = FileNotFoundError("buf not found")
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-            command, exit_code, stdout, stderr = getbuf._execute_buf_generate()
+        with pytest.raises(ExecutionError, match="buf binary not found"):
+            getbuf._execute_buf_generate()
 
-            assert command == ["buf", "generate", "--template", str(buf_gen_path)]
-            assert exit_code == 0
-            assert stdout == "Generated successfully"
-            assert stderr == ""
 
-            mock_subprocess.assert_called_once_with(
-                ["buf", "generate", "--template", str(buf_gen_path)],
-                cwd=source_dir,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+class TestGetBufTelemetry:
+    """Test GetBuf telemetry gathering."""
 
-    @patch("getbuf.core.subprocess.run")
-    def test_execute_buf_generate_not_found(self, mock_subprocess):
-        """Test handling when buf binary is not found."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+    def setup_method(self):
+        """Start every test with a cold tool-version cache."""
+        core._TOOL_VERSION_CACHE.clear()
 
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
+    def _fake_binaries(self, fs, temp_dir: Path):
+        """Create fake tool binaries and return a shutil.which replacement."""
+        bin_dir = temp_dir / "bin"
+        for name in ("buf", "protoc-gen-python_betterproto"):
+            fs.create_file(bin_dir / name, contents="#!/bin/sh\n")
 
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
+        return lambda name: str(bin_dir / name)
 
-            mock_subprocess.side_effect = FileNotFoundError("buf not found")
+    def test_gather_telemetry_success(
+        self, mock_run, buf_setup, getbuf, monkeypatch, fs
+    ):
+        """Test successful telemetry gathering."""
+        source_dir, _ = buf_setup
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        # Mock version calls (probed concurrently, so dispatch on argv)
+        versions = {
+            "buf": _Completed(0, "1.44.0", ""),
+            "protoc-gen-python_betterproto": _Completed(0, "2.0.0", ""),
+        }
+        mock_run.side_effect = lambda cmd, **kwargs: versions[Path(cmd[0]).name]
 
-            with pytest.raises(ExecutionError, match="buf binary not found"):
-                getbuf._execute_buf_generate()
+        monkeypatch.setenv("BUF_CACHE_DIR", ".cache")
 
+        with patch(
+            "getbuf.core.shutil.which", self._fake_binaries(fs, source_dir.parent)
+        ):
+            buf_version, plugin_version, env_subset = getbuf._gather_telemetry()
 
-class TestGetBufTelemetry:
-    """Test GetBuf telemetry gathering."""
+        assert buf_version == "1.44.0"
+        assert plugin_version == "2.0.0"
+        assert env_subset == {"BUF_CACHE_DIR": ".cache"}
 
-    @patch("getbuf.core.subprocess.run")
-    def test_gather_telemetry_success(self, mock_subprocess):
-        """Test successful telemetry gathering."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
-
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            # Mock version calls
-            mock_subprocess.side_effect = [
-                MagicMock(returncode=0, stdout="1.44.0"),  # buf --version
-                MagicMock(returncode=0, stdout="2.0.0"),  # plugin --version
-            ]
-
-            with patch.dict("os.environ", {"BUF_CACHE_DIR": ".cache"}):
-                buf_version, plugin_version, env_subset = getbuf._gather_telemetry()
-
-            assert buf_version == "1.44.0"
-            assert plugin_version == "2.0.0"
-            assert env_subset == {"BUF_CACHE_DIR": ".cache"}
-
-    @patch("getbuf.core.subprocess.run")
-    def test_gather_telemetry_version_failures(self, mock_subprocess):
+    def test_gather_telemetry_version_failures(self, mock_run, buf_setup, getbuf, fs):
         """Test telemetry gathering when version calls fail."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
+        source_dir, _ = buf_setup
 
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [{"name": "python_betterproto2", "out": "./generated"}],
-            }
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, "w") as f:
-                yaml.dump(buf_gen_content, f)
+        # Mock version calls to fail
+        mock_run.side_effect = FileNotFoundError("Not found")
 
-            getbuf = GetBuf(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        with patch(
+            "getbuf.core.shutil.which", self._fake_binaries(fs, source_dir.parent)
+        ):
+            buf_version, plugin_version, env_subset = getbuf._gather_telemetry()
 
-            # Mock version calls to fail
-            mock_subprocess.side_effect = FileNotFoundError("Not found")
+        assert buf_version is None
+        assert plugin_version is None
+        assert isinstance(env_subset, dict)
 
-            buf_version, plugin_version, env_subset = getbuf._gather_telemetry()
+    def test_gather_telemetry_skips_pool_when_cached(
+        self, mock_run, buf_setup, getbuf, monkeypatch, fs
+    ):
+        """Test that cached versions are reused without starting a thread pool."""
+        source_dir, _ = buf_setup
 
-            assert buf_version is None
-            assert plugin_version is None
-            assert isinstance(env_subset, dict)
+        versions = {
+            "buf": _Completed(0, "1.44.0", ""),
+            "protoc-gen-python_betterproto": _Completed(0, "2.0.0", ""),
+        }
+        mock_run.side_effect = lambda cmd, **kwargs: versions[Path(cmd[0]).name]
+        fake_which = self._fake_binaries(fs, source_dir.parent)
+
+        with patch("getbuf.core.shutil.which", fake_which):
+            getbuf._gather_telemetry()
+            assert mock_run.call_count == 2
+
+            # Warm cache: no pool and no probes
+            pool = MagicMock(side_effect=AssertionError("pool started"))
+            monkeypatch.setattr(core, "ThreadPoolExecutor", pool)
+            buf_version, plugin_version, _ = getbuf._gather_telemetry()
+            assert (buf_version, plugin_version) == ("1.44.0", "2.0.0")
+            assert mock_run.call_count == 2
+
+            # One miss is probed inline, still without a pool
+            Path(fake_which("buf")).write_text("#!/bin/sh\n# upgraded\n")
+            versions["buf"] = _Completed(0, "1.45.0", "")
+            buf_version, plugin_version, _ = getbuf._gather_telemetry()
+            assert (buf_version, plugin_version) == ("1.45.0", "2.0.0")
+            assert mock_run.call_count == 3
+
+    def test_tool_version_cached_until_binary_changes(self, mock_run, fs):
+        """Test that version probes are reused until the binary changes."""
+        fake_which = self._fake_binaries(fs, Path("/work"))
+
+        mock_run.return_value = _Completed(0, "1.44.0", "")
+
+        with patch("getbuf.core.shutil.which", fake_which):
+            assert core._cached_tool_version("buf", "buf") == "1.44.0"
+            assert core._cached_tool_version("buf", "buf") == "1.44.0"
+            assert mock_run.call_count == 1
+
+            # Upgrading the binary changes its identity and forces a re-probe
+            Path(fake_which("buf")).write_text("#!/bin/sh\n# upgraded\n")
+            mock_run.return_value = _Completed(0, "1.45.0", "")
+
+            assert core._cached_tool_version("buf", "buf") == "1.45.0"
+            assert mock_run.call_count == 2
+
+    def test_tool_version_missing_binary(self):
+        """Test that a binary missing from PATH is reported as None."""
+        with patch("getbuf.core.shutil.which", return_value=None):
+            assert core._cached_tool_version("buf", "buf") is None
@@ -2,15 +2,37 @@
 
 from __future__ import annotations
 
-import json
 import os
-import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from getbuf.logging import LogEntry, logger
 
+try:  # Same optional speedup the package uses
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    from json import loads as _loads
+
+# With --dist loadgroup, xdist keeps these tests together on one worker
+pytestmark = pytest.mark.xdist_group("logging")
+
+
+@pytest.fixture
+def getbuf_logger(tmp_path):
+    """GetBufLogger writing JSONL into the test's tmp_path."""
+    from getbuf.logging import GetBufLogger
+
+    test_logger = GetBufLogger("test")
+    test_logger.set_log_dir(tmp_path)
+    yield test_logger
+
+    # Named stdlib loggers are process-wide; don't let handlers pile up
+    for handler in list(test_logger._logger.handlers):
+        test_logger._logger.removeHandler(handler)
+        handler.close()
+
 
 class TestLogEntry:
     """Test LogEntry Pydantic model."""
@@ -28,18 +50,19 @@ class TestLogEntry:
         assert entry.context == {"key": "value"}
         assert entry.timestamp is not None
     
-    def test_log_entry_level_validation(self):
-        """Test log level validation."""
-        # Valid levels should work
-        for level in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
-            entry = LogEntry(level=level, message="test")
-            assert entry.level == level
-        
-        # Lowercase should be converted to uppercase
+    @pytest.mark.parametrize("level", ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+    def test_log_entry_valid_level(self, level):
+        """Test that every standard log level is accepted."""
+        entry = LogEntry(level=level, message="test")
+        assert entry.level == level
+    
+    def test_log_entry_lowercase_level(self):
+        """Test that lowercase levels are converted to uppercase."""
         entry = LogEntry(level="info", message="test")
         assert entry.level == "INFO"
-        
-        # Invalid levels should raise ValueError
+    
+    def test_log_entry_invalid_level(self):
+        """Test that unknown levels raise ValueError."""
         with pytest.raises(ValueError, match="Invalid log level"):
             LogEntry(level="INVALID", message="test")
     
@@ -49,7 +72,7 @@ class TestLogEntry:
         json_str = entry.model_dump_json()
         
         # Should be valid JSON
-        data = json.loads(json_str)
+        data = _loads(json_str)
         assert data["level"] == "INFO"
         assert data["message"] == "Test"
         assert data["context"]["num"] == 42
@@ -58,57 +81,305 @@ class TestLogEntry:
 class TestLogging:
     """Test logging system functionality."""
     
-    def test_logger_writes_jsonl(self):
+    def test_logger_writes_jsonl(self, getbuf_logger, tmp_path):
         """Test that logger writes JSONL files correctly."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Set custom log directory
-            os.environ['GETBUF_LOG_DIR'] = temp_dir
-            
-            # Import logger after setting env var to use custom directory
-            from getbuf.logging import GetBufLogger
-            test_logger = GetBufLogger("test")
-            
-            # Write test log entries
-            test_logger.info("Test info message", test_key="test_value")
-            test_logger.error("Test error message", error_code=500)
-            
-            # Find the log file
-            log_dir = Path(temp_dir)
-            log_files = list(log_dir.glob("getbuf_*.jsonl"))
-            assert len(log_files) == 1
-            
-            # Read and verify JSONL content
-            log_file = log_files[0]
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            assert len(lines) == 2
-            
-            # Verify first log entry
-            entry1 = json.loads(lines[0])
-            assert entry1["level"] == "INFO"
-            assert entry1["message"] == "Test info message"
-            assert entry1["context"]["test_key"] == "test_value"
-            assert "timestamp" in entry1
-            
-            # Verify second log entry
-            entry2 = json.loads(lines[1])
-            assert entry2["level"] == "ERROR"
-            assert entry2["message"] == "Test error message"
-            assert entry2["context"]["error_code"] == 500
+        # Write test log entries
+        getbuf_logger.info("Test info message", test_key="test_value")
+        getbuf_logger.error("Test error message", error_code=500)
+        
+        # Find the log file
+        with os.scandir(tmp_path) as entries:
+            log_files = [
+                e for e in entries
+                if e.name.startswith("getbuf_") and e.name.endswith(".jsonl")
+            ]
+        assert len(log_files) == 1
+        
+        # Read and verify JSONL content
+        log_file = log_files[0]
+        lines = Path(log_file.path).read_text(encoding='utf-8').splitlines()
+        
+        assert len(lines) == 2
+        
+        # Verify first log entry
+        entry1 = _loads(lines[0])
+        assert entry1["level"] == "INFO"
+        assert entry1["message"] == "Test info message"
+        assert entry1["context"]["test_key"] == "test_value"
+        assert "timestamp" in entry1
+        
+        # Verify second log entry
+        entry2 = _loads(lines[1])
+        assert entry2["level"] == "ERROR"
+        assert entry2["message"] == "Test error message"
+        assert entry2["context"]["error_code"] == 500
     
-    def test_default_log_directory(self):
+    def test_set_log_dir_redirects_output(self, getbuf_logger, tmp_path):
+        """Test that set_log_dir closes the old file and writes to the new directory."""
+        getbuf_logger.info("first")
+        old_handler = getbuf_logger._jsonl_handler
+        
+        new_dir = tmp_path / "redirected"
+        getbuf_logger.set_log_dir(new_dir)
+        getbuf_logger.info("second")
+        
+        assert old_handler._fd is None
+        assert old_handler not in getbuf_logger._logger.handlers
+        assert len(old_handler.log_file.read_text(encoding='utf-8').splitlines()) == 1
+        new_file = getbuf_logger._jsonl_handler.log_file
+        assert new_file.parent == new_dir
+        assert _loads(new_file.read_text(encoding='utf-8'))["message"] == "second"
+    
+    def test_default_log_directory(self, monkeypatch, tmp_path):
         """Test default log directory creation."""
-        # Clear environment variable
-        if 'GETBUF_LOG_DIR' in os.environ:
-            del os.environ['GETBUF_LOG_DIR']
+        # Run from tmp_path so ./logs doesn't land in the working tree
+        monkeypatch.delenv('GETBUF_LOG_DIR', raising=False)
+        monkeypatch.chdir(tmp_path)
         
         from getbuf.logging import GetBufLogger
         test_logger = GetBufLogger("test_default")
         
-        # Write a log entry to trigger directory creation
-        test_logger.info("Test message")
+        try:
+            # Write a log entry to trigger directory creation
+            test_logger.info("Test message")
+        finally:
+            for handler in list(test_logger._logger.handlers):
+                test_logger._logger.removeHandler(handler)
+                handler.close()
         
         # Check that ./logs directory was created
-        assert Path("./logs").exists()
-        assert Path("./logs").is_dir()
\ No newline at end of file
+        assert (tmp_path / "logs").is_dir()
+
+    def test_import_has_no_filesystem_side_effects(self, tmp_path):
+        """Test that importing getbuf creates the logger but no log directory."""
+        import subprocess
+        import sys
+
+        log_dir = tmp_path / "logs"
+        code = (
+            "import getbuf\n"
+            "import getbuf.logging as m\n"
+            "assert m.logger is m.logger\n"
+        )
+        env = {**os.environ, "GETBUF_LOG_DIR": str(log_dir)}
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+        assert not log_dir.exists()
+
+    def test_handler_keeps_file_open_between_records(self, tmp_path):
+        """Test that JSONLHandler reuses one descriptor and closes it cleanly."""
+        import logging
+
+        from getbuf.logging import JSONLHandler
+
+        handler = JSONLHandler(tmp_path)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "first", None, None)
+
+        handler.handle(record)
+        fd = handler._fd
+        handler.handle(record)
+
+        assert handler._fd == fd
+        assert len(handler.log_file.read_text(encoding='utf-8').splitlines()) == 2
+
+        with patch("getbuf.logging.os.close", wraps=os.close) as mock_close:
+            handler.close()
+        mock_close.assert_called_once_with(fd)
+        assert handler._fd is None
+
+    def test_background_handler_batches_writes(self, tmp_path):
+        """Test that the background writer keeps order and drains on flush/close."""
+        import logging
+
+        from getbuf.logging import JSONLHandler
+
+        handler = JSONLHandler(tmp_path, background=True)
+        for i in range(300):
+            handler.handle(
+                logging.LogRecord("test", logging.INFO, __file__, 1, f"m{i}", None, None)
+            )
+
+        handler.flush()
+        lines = handler.log_file.read_text(encoding='utf-8').splitlines()
+        assert [_loads(line)["message"] for line in lines] == [
+            f"m{i}" for i in range(300)
+        ]
+
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "last", None, None))
+        handler.close()
+        lines = handler.log_file.read_text(encoding='utf-8').splitlines()
+        assert _loads(lines[-1])["message"] == "last"
+        assert handler._fd is None
+
+    def test_close_keeps_fd_while_background_writer_is_stuck(
+        self, monkeypatch, tmp_path
+    ):
+        """Test that close() never closes the fd under a still-running write."""
+        import logging
+        import threading
+
+        import getbuf.logging as gb_logging
+
+        handler = gb_logging.JSONLHandler(tmp_path, background=True)
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "a", None, None))
+        handler.flush()
+        fd = handler._fd
+        assert fd is not None
+
+        release = threading.Event()
+        real_write = handler._write
+
+        def stuck_write(payload):
+            release.wait()
+            real_write(payload)
+
+        monkeypatch.setattr(handler, "_write", stuck_write)
+        monkeypatch.setattr(gb_logging, "_CLOSE_TIMEOUT_S", 0.01)
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "b", None, None))
+
+        handler.close()
+        assert handler._fd == fd
+        os.fstat(fd)  # still open
+
+        release.set()
+        handler._writer.join(timeout=5)
+        handler.close()
+        assert handler._fd is None
+        lines = handler.log_file.read_text(encoding='utf-8').splitlines()
+        assert [_loads(line)["message"] for line in lines] == ["a", "b"]
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_handler_lines_match_log_entry_schema(self, use_orjson, monkeypatch, tmp_path):
+        """Test that emitted lines validate as LogEntry with either encoder."""
+        import logging
+
+        import getbuf.logging as gb_logging
+
+        if use_orjson and gb_logging.orjson is None:
+            pytest.skip("orjson not installed")
+        if not use_orjson:
+            monkeypatch.setattr(gb_logging, "orjson", None)
+
+        handler = gb_logging.JSONLHandler(tmp_path)
+        record = logging.LogRecord("test", logging.WARNING, __file__, 1, "msg", None, None)
+        record.context = {"path": Path("/tmp/out"), "count": 3}
+
+        handler.handle(record)
+        handler.close()
+
+        line = handler.log_file.read_text(encoding='utf-8')
+        entry = LogEntry.model_validate_json(line)
+        assert entry.level == "WARNING"
+        assert entry.message == "msg"
+        assert entry.context["path"] == "/tmp/out"
+        assert entry.context["count"] == 3
+        assert _loads(line)["timestamp"].endswith("Z")
+
+    def test_handler_context_excludes_standard_record_attributes(self, tmp_path):
+        """Test that only extras and explicit context reach the JSONL entry."""
+        import logging
+
+        from getbuf.logging import JSONLHandler
+
+        handler = JSONLHandler(tmp_path)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+        record.context = {"key": "value"}
+        record.request_id = "abc"
+        # Set by Formatter.format when another handler ran first
+        record.message = "msg"
+
+        handler.handle(record)
+        handler.close()
+
+        entry = _loads(handler.log_file.read_text(encoding='utf-8'))
+        assert entry["context"] == {"request_id": "abc", "key": "value"}
+
+    def test_logger_context_bypasses_extra_scan(self):
+        """Test that GetBufLogger records carry their context in one attribute."""
+        import logging
+
+        from getbuf.logging import GetBufLogger
+
+        records = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        test_logger = GetBufLogger("test_context_attr")
+        capture = Capture()
+        test_logger._logger.addHandler(capture)
+        try:
+            test_logger.info("msg", key="value")
+        finally:
+            test_logger._logger.removeHandler(capture)
+
+        assert records[0]._getbuf_context == {"key": "value"}
+        # User handlers and filters still find it under the public name
+        assert records[0].context == {"key": "value"}
+
+    def test_isoformat_ns_matches_datetime(self):
+        """Test that the integer timestamp formatter agrees with datetime."""
+        from datetime import datetime, timedelta, timezone
+
+        from getbuf.logging import _isoformat_ns
+
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        for ns in (0, 1_700_000_000_123_456_789, 1_700_000_000_999_999_999, 951_782_400_000_001_000):
+            expected = epoch + timedelta(microseconds=ns // 1000)
+            assert _isoformat_ns(ns) == expected.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def test_timestamp_comes_from_record_creation(self, tmp_path):
+        """Test that lines carry the record's creation time, not the write time."""
+        import logging
+
+        from getbuf.logging import JSONLHandler
+
+        handler = JSONLHandler(tmp_path, background=True)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+        record.created = 1_700_000_000.25
+        if hasattr(record, "created_ns"):
+            record.created_ns = 1_700_000_000_250_000_000
+
+        handler.handle(record)
+        handler.close()
+
+        line = handler.log_file.read_text(encoding='utf-8')
+        assert _loads(line)["timestamp"] == "2023-11-14T22:13:20.250000Z"
+        assert "created_ns" not in _loads(line)["context"]
+
+    def test_background_writer_enabled_from_environment(self, monkeypatch, tmp_path):
+        """Test that GETBUF_LOG_BACKGROUND switches the JSONL handler to batching."""
+        from getbuf.logging import GetBufLogger, JSONLHandler
+
+        monkeypatch.setenv("GETBUF_LOG_DIR", str(tmp_path))
+        monkeypatch.setenv("GETBUF_LOG_BACKGROUND", "1")
+        test_logger = GetBufLogger("test_background_env")
+        handler = next(
+            h for h in test_logger._logger.handlers if isinstance(h, JSONLHandler)
+        )
+        try:
+            assert handler._writer is not None
+        finally:
+            test_logger._logger.removeHandler(handler)
+            handler.close()
+
+    def test_is_enabled_for_follows_logger_level(self):
+        """Test that isEnabledFor reflects the underlying logger level."""
+        import logging
+
+        from getbuf.logging import GetBufLogger
+        test_logger = GetBufLogger("test_enabled_for")
+
+        assert test_logger.isEnabledFor(logging.INFO)
+        assert not test_logger.isEnabledFor(logging.DEBUG)
+
+    def test_disabled_level_skips_underlying_logger(self):
+        """Test that filtered levels never reach the stdlib logger."""
+        from getbuf.logging import GetBufLogger
+        test_logger = GetBufLogger("test_disabled_level")
+
+        with patch.object(test_logger._logger, "debug") as mock_debug:
+            test_logger.debug("dropped", key="value")
+
+        mock_debug.assert_not_called()
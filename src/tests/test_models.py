@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
+import dataclasses
 import json
-import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
@@ -23,30 +22,36 @@ from getbuf.models import (
     ValidationError,
 )
 
+# Placeholder buf.gen.yaml; GetBufConfig only checks that the file exists
+_BUF_GEN_YAML = b"version: v1\n"
+
+# Fixed timestamp so snapshot tests never read the clock
+_T0 = datetime(2024, 1, 1, 12, 0, 0)
+
 
 class TestExceptionHierarchy:
     """Test custom exception classes."""
 
-    def test_exception_hierarchy(self):
+    @pytest.mark.parametrize(
+        "sub, base",
+        [
+            (ValidationError, GetBufError),
+            (ExecutionError, GetBufError),
+            (CleanError, GetBufError),
+            (GetBufError, Exception),
+        ],
+    )
+    def test_exception_hierarchy(self, sub, base):
         """Test that exceptions inherit correctly."""
-        assert issubclass(ValidationError, GetBufError)
-        assert issubclass(ExecutionError, GetBufError)
-        assert issubclass(CleanError, GetBufError)
-        assert issubclass(GetBufError, Exception)
-
-    def test_exceptions_can_be_raised(self):
-        """Test that all exceptions can be raised with messages."""
-        with pytest.raises(GetBufError):
-            raise GetBufError("Base error")
-
-        with pytest.raises(ValidationError):
-            raise ValidationError("Validation failed")
+        assert issubclass(sub, base)
 
-        with pytest.raises(ExecutionError):
-            raise ExecutionError("Execution failed")
-
-        with pytest.raises(CleanError):
-            raise CleanError("Clean failed")
+    @pytest.mark.parametrize(
+        "exc", [GetBufError, ValidationError, ExecutionError, CleanError]
+    )
+    def test_exceptions_can_be_raised(self, exc):
+        """Test that each exception can be raised with a message."""
+        with pytest.raises(exc, match="failed"):
+            raise exc(f"{exc.__name__} failed")
 
 
 class TestGenerationResult:
@@ -114,10 +119,10 @@ class TestGenerationResult:
             written_files=[],
         )
 
-        with pytest.raises(ValueError, match="frozen"):
+        with pytest.raises(dataclasses.FrozenInstanceError):
             result.success = False
 
-    def test_generation_result_json_serialization(self):
+    def test_generation_result_json_serialization(self, monkeypatch):
         """Test JSON serialization of GenerationResult."""
         result = GenerationResult(
             success=True,
@@ -139,6 +144,49 @@ class TestGenerationResult:
         assert data["exit_code"] == 0
         assert data["command"] == ["buf", "generate"]
         assert data["duration_s"] == 1.5
+        assert data["logs_path"] is None
+        assert "logs_path" not in json.loads(result.model_dump_json(exclude_none=True))
+
+        # The bytes encoder produces the same document
+        assert result.to_json_bytes() == json_str.encode("utf-8")
+        # Keys follow field declaration order, so the bytes are a stable key
+        assert list(json.loads(result.to_json_bytes())) == [
+            f.name for f in dataclasses.fields(GenerationResult)
+        ]
+        assert result.to_json_bytes(exclude_none=True) == result.model_dump_json(
+            exclude_none=True
+        ).encode("utf-8")
+        monkeypatch.setattr("getbuf.models.orjson", None)
+        assert result.to_json_bytes() == json_str.encode("utf-8")
+
+    def test_generation_result_dump_options(self):
+        """Test include/exclude/indent and that unknown options are rejected."""
+        result = GenerationResult(
+            success=True,
+            exit_code=0,
+            command=["buf"],
+            workdir="/test",
+            duration_s=1.0,
+            stdout="",
+            stderr="",
+            out_dirs=[],
+            cleaned_dirs=[],
+            written_files=[],
+        )
+
+        assert result.model_dump(include={"success", "exit_code"}) == {
+            "success": True,
+            "exit_code": 0,
+        }
+        assert "stdout" not in result.model_dump(exclude={"stdout"})
+        assert json.loads(result.model_dump_json(indent=2)) == json.loads(
+            result.model_dump_json()
+        )
+        assert "\n" in result.model_dump_json(indent=2)
+        with pytest.raises(TypeError):
+            result.model_dump(round_trip=True)
+        with pytest.raises(TypeError):
+            result.model_dump_json(warnings=False)
 
 
 class TestPluginSpec:
@@ -156,23 +204,20 @@ class TestPluginSpec:
         assert plugin.kind == "plugin"
         assert plugin.value == "python-betterproto"
 
-    def test_invalid_kind(self):
-        """Test that invalid kind raises ValueError."""
-        with pytest.raises(ValueError, match="Plugin kind must be"):
-            PluginSpec(kind="invalid", value="python_betterproto")
-
-    def test_invalid_plugin_value(self):
-        """Test that invalid plugin values are rejected."""
-        with pytest.raises(ValueError, match="Only local BetterProto plugins"):
-            PluginSpec(kind="name", value="python_grpc")
-
-    def test_remote_plugin_rejected(self):
-        """Test that remote/BSR plugins are rejected."""
-        with pytest.raises(ValueError, match="Remote/BSR plugin references"):
-            PluginSpec(kind="name", value="buf.build/protocolbuffers/go")
-
-        with pytest.raises(ValueError, match="Remote/BSR plugin references"):
-            PluginSpec(kind="name", value="github.com/user/plugin")
+    @pytest.mark.parametrize(
+        "kind, value, match",
+        [
+            ("invalid", "python_betterproto", "Plugin kind must be"),
+            ("name", "python_grpc", "Only local BetterProto plugins"),
+            ("name", "buf.build/protocolbuffers/go", "Remote/BSR plugin references"),
+            ("name", "github.com/user/plugin", "Remote/BSR plugin references"),
+        ],
+        ids=["invalid_kind", "non_betterproto", "bsr_remote", "github_remote"],
+    )
+    def test_invalid_plugin_spec(self, kind, value, match):
+        """Test that invalid kinds and non-local plugin values are rejected."""
+        with pytest.raises(ValueError, match=match):
+            PluginSpec(kind=kind, value=value)
 
     def test_plugin_spec_immutable(self):
         """Test that PluginSpec is frozen."""
@@ -215,20 +260,40 @@ class TestFileSnapshot:
 
     def test_file_snapshot_creation(self):
         """Test creating a FileSnapshot."""
-        now = datetime.now()
+        now = _T0
         snapshot = FileSnapshot(
-            timestamp=now, files={"file1.py": 123456.0, "file2.py": 123457.0}
+            timestamp=now, files={"file1.py": 123456, "file2.py": 123457}
         )
 
-        assert snapshot.timestamp == now
-        assert snapshot.files == {"file1.py": 123456.0, "file2.py": 123457.0}
+        assert snapshot.timestamp == now.replace(tzinfo=timezone.utc).timestamp()
+        assert snapshot.taken_at == now.replace(tzinfo=timezone.utc)
+        assert snapshot.files == {"file1.py": 123456, "file2.py": 123457}
+
+    def test_file_snapshot_timestamp_serialized_as_iso(self):
+        """Test that the epoch timestamp is rendered as ISO-8601 in JSON."""
+        snapshot = FileSnapshot(timestamp=0.0, files={})
+
+        data = json.loads(snapshot.model_dump_json())
+
+        assert data["timestamp"] == "1970-01-01T00:00:00Z"
+        assert snapshot.model_dump()["timestamp"] == 0.0
+        assert snapshot.to_json_bytes() == snapshot.model_dump_json().encode("utf-8")
+
+    def test_file_snapshot_aware_timestamp_kept(self):
+        """Test that aware datetimes keep their instant and naive ones are UTC."""
+        aware = datetime(2024, 1, 1, 13, 0, 0, tzinfo=timezone(timedelta(hours=1)))
+
+        assert FileSnapshot(timestamp=aware, files={}).taken_at == datetime(
+            2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc
+        )
+        assert FileSnapshot(timestamp=_T0, files={}).timestamp == 1704110400.0
 
     def test_file_snapshot_immutable(self):
         """Test that FileSnapshot is frozen."""
-        snapshot = FileSnapshot(timestamp=datetime.now(), files={})
+        snapshot = FileSnapshot(timestamp=_T0, files={})
 
-        with pytest.raises(ValueError, match="frozen"):
-            snapshot.files = {"new": 1.0}
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.files = {"new": 1}
 
 
 class TestCleanOperation:
@@ -255,45 +320,49 @@ class TestCleanOperation:
         assert operation.cleaned is False
         assert operation.files_removed == []
 
+    def test_clean_operation_json_serialization(self):
+        """Test that Path fields are rendered as strings in JSON."""
+        operation = CleanOperation(
+            target_dir=Path("/tmp/out"), cleaned=True, files_removed=["a.py"]
+        )
+
+        data = json.loads(operation.model_dump_json())
 
-class TestGetBufConfig:
-    """Test GetBufConfig model."""
+        assert data == {"target_dir": "/tmp/out", "cleaned": True, "files_removed": ["a.py"]}
+        assert operation.model_dump()["target_dir"] == Path("/tmp/out")
+        assert operation.to_json_bytes() == operation.model_dump_json().encode("utf-8")
 
-    def test_valid_config_creation(self):
-        """Test creating a valid GetBufConfig."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
 
-            # Create required files
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
+@pytest.fixture(scope="module")
+def valid_config(source_tree, tmp_path_factory):
+    """GetBufConfig built once per module for tests that only read it."""
+    buf_gen_path = tmp_path_factory.mktemp("cfg") / "buf.gen.yaml"
+    buf_gen_path.write_bytes(_BUF_GEN_YAML)
+    return GetBufConfig(source_dir=source_tree, buf_gen_path=buf_gen_path, clean=True)
 
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
 
-            config = GetBufConfig(
-                source_dir=source_dir, buf_gen_path=buf_gen_path, clean=True
-            )
+class TestGetBufConfig:
+    """Test GetBufConfig model."""
 
-            assert config.source_dir.is_absolute()
-            assert config.buf_gen_path.is_absolute()
-            assert config.clean is True
+    def test_valid_config_creation(self, valid_config):
+        """Test creating a valid GetBufConfig."""
+        config = valid_config
 
-    def test_source_dir_missing_buf_yaml(self):
-        """Test that missing buf.yaml raises error."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        assert config.source_dir.is_absolute()
+        assert config.buf_gen_path.is_absolute()
+        assert config.clean is True
 
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            # No buf.yaml created
+    def test_source_dir_missing_buf_yaml(self, tmp_path):
+        """Test that missing buf.yaml raises error."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        # No buf.yaml created
 
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(_BUF_GEN_YAML)
 
-            with pytest.raises(ValueError, match="must contain buf.yaml"):
-                GetBufConfig(source_dir=source_dir, buf_gen_path=buf_gen_path)
+        with pytest.raises(ValueError, match="must contain buf.yaml"):
+            GetBufConfig(source_dir=source_dir, buf_gen_path=buf_gen_path)
 
     def test_nonexistent_source_dir(self):
         """Test that nonexistent source_dir raises error."""
@@ -302,70 +371,35 @@ class TestGetBufConfig:
                 source_dir=Path("/nonexistent"), buf_gen_path=Path("/also/nonexistent")
             )
 
-    def test_nonexistent_buf_gen_path(self):
+    def test_nonexistent_buf_gen_path(self, source_tree):
         """Test that nonexistent buf_gen_path raises error."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            with pytest.raises(ValueError, match="Path does not exist"):
-                GetBufConfig(
-                    source_dir=source_dir,
-                    buf_gen_path=Path("/nonexistent/buf.gen.yaml"),
-                )
+        with pytest.raises(ValueError, match="Path does not exist"):
+            GetBufConfig(
+                source_dir=source_tree,
+                buf_gen_path=Path("/nonexistent/buf.gen.yaml"),
+            )
 
-    def test_buf_gen_path_is_directory(self):
+    def test_buf_gen_path_is_directory(self, source_tree, tmp_path):
         """Test that buf_gen_path must be a file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        with pytest.raises(ValueError, match="must be a file"):
+            GetBufConfig(source_dir=source_tree, buf_gen_path=tmp_path)
 
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_dir = temp_path / "buf_gen_dir"
-            buf_gen_dir.mkdir()
-
-            with pytest.raises(ValueError, match="must be a file"):
-                GetBufConfig(source_dir=source_dir, buf_gen_path=buf_gen_dir)
-
-    def test_config_with_string_paths(self):
+    def test_config_with_string_paths(self, valid_config):
         """Test that string paths are converted to Path objects."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
-
-            # Pass strings instead of Path objects
-            config = GetBufConfig(
-                source_dir=str(source_dir), buf_gen_path=str(buf_gen_path)
-            )
+        # Pass strings instead of Path objects, reusing the fixture's files
+        config = GetBufConfig(
+            source_dir=str(valid_config.source_dir),
+            buf_gen_path=str(valid_config.buf_gen_path),
+        )
 
-            assert isinstance(config.source_dir, Path)
-            assert isinstance(config.buf_gen_path, Path)
+        # Path never compares equal to str, so this also proves the coercion
+        assert (config.source_dir, config.buf_gen_path) == (
+            valid_config.source_dir,
+            valid_config.buf_gen_path,
+        )
 
-    def test_config_immutable(self):
+    def test_config_immutable(self, valid_config):
         """Test that GetBufConfig is frozen."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            (source_dir / "buf.yaml").write_text("version: v1")
-
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            buf_gen_path.write_text("version: v1")
-
-            config = GetBufConfig(source_dir=source_dir, buf_gen_path=buf_gen_path)
-
-            with pytest.raises(ValueError, match="frozen"):
-                config.clean = True
-
+        # The rejected assignment leaves the shared instance untouched
+        with pytest.raises(ValueError, match="frozen"):
+            valid_config.clean = False
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import tempfile
+import os
 import yaml
 from pathlib import Path
+from typing import Any, Dict
 
 import pytest
 
@@ -15,53 +16,152 @@ from getbuf.parsing import (
     extract_plugin_spec,
 )
 
+# Prefer the libyaml-backed dumper, as getbuf.parsing does for loading
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper as _Dumper  # type: ignore[assignment]
+
+# (plugin entry, expected error) pairs rejected by extract_plugin_spec
+_INVALID_PLUGIN_CASES = [
+    pytest.param(
+        {
+            "name": "python_betterproto",
+            "plugin": "python-betterproto",
+            "out": "./src",
+        },
+        "cannot have both",
+        id="both_name_and_plugin",
+    ),
+    pytest.param({"out": "./src"}, "must have either", id="neither_name_nor_plugin"),
+    pytest.param(
+        {"name": 123, "out": "./src"}, "must be a string", id="non_string_value"
+    ),
+    pytest.param(
+        {"name": "python_grpc", "out": "./src"},
+        "Invalid plugin specification",
+        id="unsupported_plugin",
+    ),
+    pytest.param(
+        {"name": "buf.build/protocolbuffers/go", "out": "./src"},
+        "Invalid plugin specification",
+        id="remote_plugin",
+    ),
+]
+
+
+def _dump(content: Any) -> bytes:
+    """Render a buf.gen.yaml fixture as UTF-8; only called at module import."""
+    return yaml.dump(content, Dumper=_Dumper, encoding="utf-8")
+
+
+def _single_plugin(plugin: Dict[str, str]) -> bytes:
+    """Render a v1 buf.gen.yaml with exactly one plugin entry."""
+    return _dump({"version": "v1", "plugins": [plugin]})
+
+
+# Valid fixtures, encoded once so tests only write_bytes them
+_NAME_PLUGIN_YAML = _single_plugin({"name": "python_betterproto", "out": "./proto_gen"})
+_PLUGIN_REF_YAML = _single_plugin(
+    {"plugin": "python-betterproto", "out": "/tmp/proto_gen"}
+)
+_RELATIVE_OUT_YAML = _single_plugin(
+    {"name": "python_betterproto", "out": "../generated"}
+)
+_ABSOLUTE_OUT = "/tmp/absolute_output"
+_ABSOLUTE_OUT_YAML = _single_plugin(
+    {"name": "python_betterproto", "out": _ABSOLUTE_OUT}
+)
+
+# (buf.gen.yaml bytes, expected error) pairs rejected by parse_buf_gen_yaml
+_INVALID_BUF_GEN_CASES = [
+    pytest.param(_dump(content), match, id=case_id)
+    for content, match, case_id in [
+        (
+            {
+                "version": "v2",
+                "plugins": [{"name": "python_betterproto", "out": "./out"}],
+            },
+            "version must be 'v1'",
+            "wrong_version",
+        ),
+        ({"version": "v1"}, "must contain 'plugins'", "missing_plugins"),
+        (
+            {"version": "v1", "plugins": {"name": "python_betterproto"}},
+            "must be a list",
+            "plugins_not_list",
+        ),
+        (
+            {
+                "version": "v1",
+                "plugins": [
+                    {"name": "python_betterproto", "out": "./out1"},
+                    {"name": "python_betterproto", "out": "./out2"},
+                ],
+            },
+            "Exactly one plugin required",
+            "multiple_plugins",
+        ),
+        (
+            {"version": "v1", "plugins": []},
+            "Exactly one plugin required",
+            "empty_plugins",
+        ),
+        (
+            {"version": "v1", "plugins": ["python_betterproto"]},
+            "must be an object",
+            "plugin_not_object",
+        ),
+        (
+            {"version": "v1", "plugins": [{"name": "python_betterproto"}]},
+            "must specify 'out'",
+            "missing_out",
+        ),
+    ]
+]
+
 
 class TestValidateBufYaml:
     """Test buf.yaml validation."""
     
-    def test_valid_buf_yaml(self):
+    def test_valid_buf_yaml(self, tmp_path):
         """Test validation of valid buf.yaml."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            buf_yaml = Path(temp_dir) / "buf.yaml"
-            buf_yaml.write_text("version: v1\n")
-            
-            # Should not raise
-            validate_buf_yaml(buf_yaml)
+        buf_yaml = tmp_path / "buf.yaml"
+        buf_yaml.write_bytes(b"version: v1\n")
+        
+        # Should not raise
+        validate_buf_yaml(buf_yaml)
     
-    def test_missing_buf_yaml(self):
+    def test_missing_buf_yaml(self, tmp_path):
         """Test error when buf.yaml is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            buf_yaml = Path(temp_dir) / "nonexistent.yaml"
-            
-            with pytest.raises(ValidationError, match="not found"):
-                validate_buf_yaml(buf_yaml)
+        buf_yaml = tmp_path / "nonexistent.yaml"
+        
+        with pytest.raises(ValidationError, match="not found"):
+            validate_buf_yaml(buf_yaml)
     
-    def test_buf_yaml_is_directory(self):
+    def test_buf_yaml_is_directory(self, tmp_path):
         """Test error when buf.yaml is a directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            buf_yaml = Path(temp_dir) / "buf.yaml"
-            buf_yaml.mkdir()
-            
-            with pytest.raises(ValidationError, match="must be a file"):
-                validate_buf_yaml(buf_yaml)
+        buf_yaml = tmp_path / "buf.yaml"
+        buf_yaml.mkdir()
+        
+        with pytest.raises(ValidationError, match="must be a file"):
+            validate_buf_yaml(buf_yaml)
     
-    def test_invalid_yaml_content(self):
+    def test_invalid_yaml_content(self, tmp_path):
         """Test error with invalid YAML syntax."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            buf_yaml = Path(temp_dir) / "buf.yaml"
-            buf_yaml.write_text("invalid: yaml: content: [")
-            
-            with pytest.raises(ValidationError, match="Invalid YAML"):
-                validate_buf_yaml(buf_yaml)
+        buf_yaml = tmp_path / "buf.yaml"
+        buf_yaml.write_text("invalid: yaml: content: [")
+        
+        with pytest.raises(ValidationError, match="Invalid YAML"):
+            validate_buf_yaml(buf_yaml)
     
-    def test_non_object_yaml(self):
+    def test_non_object_yaml(self, tmp_path):
         """Test error when YAML is not an object."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            buf_yaml = Path(temp_dir) / "buf.yaml"
-            buf_yaml.write_text("- not an object")
-            
-            with pytest.raises(ValidationError, match="must contain a YAML object"):
-                validate_buf_yaml(buf_yaml)
+        buf_yaml = tmp_path / "buf.yaml"
+        buf_yaml.write_text("- not an object")
+        
+        with pytest.raises(ValidationError, match="must contain a YAML object"):
+            validate_buf_yaml(buf_yaml)
 
 
 class TestExtractPluginSpec:
@@ -83,315 +183,108 @@ class TestExtractPluginSpec:
         assert spec.kind == "plugin"
         assert spec.value == "python-betterproto"
     
-    def test_both_name_and_plugin(self):
-        """Test error when both 'name' and 'plugin' are present."""
-        plugin_dict = {
-            "name": "python_betterproto",
-            "plugin": "python-betterproto",
-            "out": "./src"
-        }
-        
-        with pytest.raises(ValidationError, match="cannot have both"):
-            extract_plugin_spec(plugin_dict)
-    
-    def test_neither_name_nor_plugin(self):
-        """Test error when neither 'name' nor 'plugin' are present."""
-        plugin_dict = {"out": "./src"}
-        
-        with pytest.raises(ValidationError, match="must have either"):
-            extract_plugin_spec(plugin_dict)
-    
-    def test_non_string_plugin_value(self):
-        """Test error when plugin value is not a string."""
-        plugin_dict = {"name": 123, "out": "./src"}
-        
-        with pytest.raises(ValidationError, match="must be a string"):
-            extract_plugin_spec(plugin_dict)
-    
-    def test_invalid_plugin_type(self):
-        """Test error with unsupported plugin type."""
-        plugin_dict = {"name": "python_grpc", "out": "./src"}
-        
-        with pytest.raises(ValidationError, match="Invalid plugin specification"):
-            extract_plugin_spec(plugin_dict)
-    
-    def test_remote_plugin_rejected(self):
-        """Test rejection of remote/BSR plugin references."""
-        plugin_dict = {"name": "buf.build/protocolbuffers/go", "out": "./src"}
-        
-        with pytest.raises(ValidationError, match="Invalid plugin specification"):
+    @pytest.mark.parametrize("plugin_dict, match", _INVALID_PLUGIN_CASES)
+    def test_invalid_plugin_spec(self, plugin_dict, match):
+        """Test that malformed or unsupported plugin entries are rejected."""
+        with pytest.raises(ValidationError, match=match):
             extract_plugin_spec(plugin_dict)
 
 
 class TestParseBufGenYaml:
     """Test buf.gen.yaml parsing and validation."""
     
-    def test_valid_buf_gen_yaml_name(self):
+    def test_valid_buf_gen_yaml_name(self, source_tree, tmp_path):
         """Test parsing valid buf.gen.yaml with 'name' plugin."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {
-                        "name": "python_betterproto",
-                        "out": "./proto_gen"
-                    }
-                ]
-            }
-            
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            spec = parse_buf_gen_yaml(buf_gen_path, source_dir)
-            
-            assert spec.version == "v1"
-            assert spec.plugin.kind == "name"
-            assert spec.plugin.value == "python_betterproto"
-            assert spec.out_dir == (source_dir / "proto_gen").resolve()
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(_NAME_PLUGIN_YAML)
+        
+        spec = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        
+        assert spec.version == "v1"
+        assert spec.plugin.kind == "name"
+        assert spec.plugin.value == "python_betterproto"
+        assert spec.out_dir == Path(os.path.abspath(source_tree / "proto_gen"))
     
-    def test_valid_buf_gen_yaml_plugin(self):
+    def test_valid_buf_gen_yaml_plugin(self, source_tree, tmp_path):
         """Test parsing valid buf.gen.yaml with 'plugin' reference."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {
-                        "plugin": "python-betterproto",
-                        "out": "/tmp/proto_gen"
-                    }
-                ]
-            }
-            
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            spec = parse_buf_gen_yaml(buf_gen_path, source_dir)
-            
-            assert spec.plugin.kind == "plugin"
-            assert spec.plugin.value == "python-betterproto"
-            assert spec.out_dir == Path("/tmp/proto_gen").resolve()
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(_PLUGIN_REF_YAML)
+        
+        spec = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        
+        assert spec.plugin.kind == "plugin"
+        assert spec.plugin.value == "python-betterproto"
+        assert spec.out_dir == Path("/tmp/proto_gen")
     
-    def test_missing_buf_gen_yaml(self):
+    def test_missing_buf_gen_yaml(self, source_tree, tmp_path):
         """Test error when buf.gen.yaml is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            buf_gen_path = Path(temp_dir) / "nonexistent.yaml"
-            
-            with pytest.raises(ValidationError, match="not found"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
+        buf_gen_path = tmp_path / "nonexistent.yaml"
+        
+        with pytest.raises(ValidationError, match="not found"):
+            parse_buf_gen_yaml(buf_gen_path, source_tree)
     
-    def test_invalid_yaml_syntax(self):
+    def test_invalid_yaml_syntax(self, source_tree, tmp_path):
         """Test error with invalid YAML syntax."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            buf_gen_path.write_text("invalid: yaml: [")
-            
-            with pytest.raises(ValidationError, match="Invalid YAML"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_text("invalid: yaml: [")
+        
+        with pytest.raises(ValidationError, match="Invalid YAML"):
+            parse_buf_gen_yaml(buf_gen_path, source_tree)
     
-    def test_non_object_yaml(self):
+    def test_non_object_yaml(self, source_tree, tmp_path):
         """Test error when YAML root is not an object."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            buf_gen_path.write_text("- not an object")
-            
-            with pytest.raises(ValidationError, match="must contain a YAML object"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_invalid_version(self):
-        """Test error with wrong version."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v2",
-                "plugins": [{"name": "python_betterproto", "out": "./out"}]
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="version must be 'v1'"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_missing_plugins(self):
-        """Test error when plugins section is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {"version": "v1"}
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="must contain 'plugins'"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_plugins_not_list(self):
-        """Test error when plugins is not a list."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": {"name": "python_betterproto"}
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="must be a list"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_multiple_plugins(self):
-        """Test error with multiple plugins."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {"name": "python_betterproto", "out": "./out1"},
-                    {"name": "python_betterproto", "out": "./out2"}
-                ]
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="Exactly one plugin required"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_empty_plugins_list(self):
-        """Test error with empty plugins list."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": []
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="Exactly one plugin required"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
-    
-    def test_plugin_not_object(self):
-        """Test error when plugin entry is not an object."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": ["python_betterproto"]
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="must be an object"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_text("- not an object")
+        
+        with pytest.raises(ValidationError, match="must contain a YAML object"):
+            parse_buf_gen_yaml(buf_gen_path, source_tree)
     
-    def test_missing_out_directory(self):
-        """Test error when 'out' directory is missing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            source_dir = Path(temp_dir) / "source"
-            source_dir.mkdir()
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {"name": "python_betterproto"}
-                ]
-            }
-            
-            buf_gen_path = Path(temp_dir) / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            with pytest.raises(ValidationError, match="must specify 'out'"):
-                parse_buf_gen_yaml(buf_gen_path, source_dir)
+    @pytest.mark.parametrize("buf_gen_yaml, match", _INVALID_BUF_GEN_CASES)
+    def test_invalid_buf_gen(self, buf_gen_yaml, match, source_tree, tmp_path):
+        """Test that structurally invalid buf.gen.yaml content is rejected."""
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(buf_gen_yaml)
+        
+        with pytest.raises(ValidationError, match=match):
+            parse_buf_gen_yaml(buf_gen_path, source_tree)
     
-    def test_relative_path_resolution(self):
+    def test_relative_path_resolution(self, tmp_path):
         """Test that relative paths are resolved against source_dir."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir = temp_path / "project" / "proto"
-            source_dir.mkdir(parents=True)
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {
-                        "name": "python_betterproto",
-                        "out": "../generated"
-                    }
-                ]
-            }
-            
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            spec = parse_buf_gen_yaml(buf_gen_path, source_dir)
-            
-            expected_path = (source_dir / "../generated").resolve()
-            assert spec.out_dir == expected_path
+        source_dir = tmp_path / "project" / "proto"
+        source_dir.mkdir(parents=True)
+        
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(_RELATIVE_OUT_YAML)
+        
+        spec = parse_buf_gen_yaml(buf_gen_path, source_dir)
+        
+        expected_path = Path(os.path.normpath(source_dir / "../generated"))
+        assert spec.out_dir == expected_path
     
-    def test_absolute_path_preserved(self):
+    def test_absolute_path_preserved(self, source_tree, tmp_path):
         """Test that absolute paths are preserved."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            source_dir = temp_path / "source"
-            source_dir.mkdir()
-            
-            absolute_out = "/tmp/absolute_output"
-            
-            buf_gen_content = {
-                "version": "v1",
-                "plugins": [
-                    {
-                        "name": "python_betterproto",
-                        "out": absolute_out
-                    }
-                ]
-            }
-            
-            buf_gen_path = temp_path / "buf.gen.yaml"
-            with open(buf_gen_path, 'w') as f:
-                yaml.dump(buf_gen_content, f)
-            
-            spec = parse_buf_gen_yaml(buf_gen_path, source_dir)
-            
-            assert spec.out_dir == Path(absolute_out).resolve()
\ No newline at end of file
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_bytes(_ABSOLUTE_OUT_YAML)
+        
+        spec = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        
+        assert spec.out_dir == Path(_ABSOLUTE_OUT)
+
+    def test_parse_is_memoized_until_file_changes(self, source_tree, tmp_path):
+        """Test that unchanged files reuse the parsed spec and edits re-parse."""
+        buf_gen_path = tmp_path / "buf.gen.yaml"
+        buf_gen_path.write_text(
+            "version: v1\nplugins:\n  - name: python_betterproto\n    out: ./a\n"
+        )
+
+        first = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        second = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        assert second is first
+
+        buf_gen_path.write_text(
+            "version: v1\nplugins:\n  - name: python_betterproto\n    out: ./bb\n"
+        )
+
+        third = parse_buf_gen_yaml(buf_gen_path, source_tree)
+        assert third is not first
+        assert third.out_dir == Path(os.path.abspath(source_tree / "bb"))
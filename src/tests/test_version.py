@@ -5,25 +5,78 @@
 from __future__ import annotations
 
 import re
-from types import SimpleNamespace
+from collections import namedtuple
 from typing import Any, Callable
 
 import pytest
 
 from getbuf.version import (
     __version__,
+    _find_semver,
     detect_buf_version,
     detect_plugin_version,
     get_getbuf_version,
     get_version_info,
 )
 
-SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+(?:[-+][A-Za-z0-9.\-_]+)?$")
+# Canonical semver.org grammar. Prerelease and build are separate groups of
+# dot-separated identifiers, so no repeated class also swallows the "."
+# separator and a failed match can't backtrack through ambiguous splits.
+# Alternatives are ordered by how often they occur (non-zero numbers first);
+# the pattern is anchored at both ends, so order doesn't change what matches
+_NUM = r"(?:[1-9]\d*|0)"
+_PRERELEASE_ID = r"(?:[1-9]\d*|\d*[A-Za-z-][0-9A-Za-z-]*|0)"
+_BUILD_ID = r"[0-9A-Za-z-]+"
+SEMVER_RE = re.compile(
+    rf"^{_NUM}\.{_NUM}\.{_NUM}"
+    rf"(?:-{_PRERELEASE_ID}(?:\.{_PRERELEASE_ID})*)?"
+    rf"(?:\+{_BUILD_ID}(?:\.{_BUILD_ID})*)?$"
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_version_caches():
+    """Version probes are cached per process; isolate each test."""
+    detect_buf_version.cache_clear()
+    detect_plugin_version.cache_clear()
+    yield
+    detect_buf_version.cache_clear()
+    detect_plugin_version.cache_clear()
+
+
+# Installer returned by the patch_run fixture
+_PatchRun = Callable[[Callable[..., Any]], None]
+
+
+@pytest.fixture
+def patch_run(monkeypatch: pytest.MonkeyPatch) -> _PatchRun:
+    """
+    Return a function that installs a fake subprocess.run for version probes.
+
+    Every binary is also reported as present on PATH, so the probes reach
+    the fake run; tests override getbuf.version.shutil.which to hide some.
+    """
+
+    def _patch(fake_run: Callable[..., Any]) -> None:
+        # Patched through the names getbuf.version looks up at call time
+        monkeypatch.setattr("getbuf.version.subprocess.run", fake_run)
+        monkeypatch.setattr(
+            "getbuf.version.shutil.which", lambda name: f"/usr/bin/{name}"
+        )
+
+    return _patch
+
+
+# Stand-in for subprocess.CompletedProcess with the fields the probes read
+_FakeCompleted = namedtuple("_FakeCompleted", ["stdout", "stderr", "returncode"])
+
+# Shared result for probes that print nothing
+_EMPTY_RUN = _FakeCompleted("", "", 0)
 
 
 def _fake_run(stdout: str = "", stderr: str = "", returncode: int = 0) -> Any:
     """Create a fake object similar to subprocess.CompletedProcess."""
-    return SimpleNamespace(stdout=stdout, stderr=stderr, returncode=returncode)
+    return _FakeCompleted(stdout, stderr, returncode)
 
 
 def test_library_version_constant_format():
@@ -45,56 +98,102 @@ def test_get_getbuf_version_matches_constant():
         "1.2.3+build.7\n",
     ],
 )
-def test_detect_buf_version_parsing(monkeypatch: pytest.MonkeyPatch, output: str):
-    import subprocess  # local import to patch cleanly
-
+def test_detect_buf_version_parsing(patch_run: _PatchRun, output: str):
     def fake_run(cmd: list[str], **_: Any):
-        assert cmd[:2] == ["buf", "--version"]
+        assert cmd[0] == "buf" and cmd[1] == "--version"
         return _fake_run(stdout=output)
 
-    monkeypatch.setattr(subprocess, "run", fake_run)  # type: ignore[attr-defined]
+    patch_run(fake_run)
     ver = detect_buf_version()
     assert ver is not None
     assert SEMVER_RE.match(ver) is not None
 
 
-def test_detect_buf_version_missing_binary(monkeypatch: pytest.MonkeyPatch):
-    import subprocess
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("buf 1.2 then 3.4.5-rc.1+x", "3.4.5-rc.1"),
+        ("1.x.2.3.4", "2.3.4"),
+        ("1.2.3- trailing", "1.2.3"),
+        ("no version here", None),
+        ("1" * 20000, None),  # linear scan; the old regex was quadratic here
+    ],
+)
+def test_find_semver(text: str, expected: str | None):
+    assert _find_semver(text) == expected
+
 
+def test_detect_buf_version_missing_binary(patch_run: _PatchRun):
     def fake_run(*_: Any, **__: Any):
         raise FileNotFoundError
 
-    monkeypatch.setattr(subprocess, "run", fake_run)  # type: ignore[attr-defined]
+    patch_run(fake_run)
     assert detect_buf_version() is None
 
 
-def test_detect_plugin_version_first_candidate_hits(monkeypatch: pytest.MonkeyPatch):
-    import subprocess
-
+def test_detect_plugin_version_first_candidate_hits(patch_run: _PatchRun):
     calls: list[list[str]] = []
 
     def fake_run(cmd: list[str], **_: Any):
         calls.append(cmd)
-        # Make the first candidate succeed
+        # Make the first candidate succeed; a later one would too
         if cmd[0] == "protoc-gen-python_betterproto":
             return _fake_run(stdout="1.9.0")
-        return _fake_run(stdout="", stderr="", returncode=0)
+        if cmd[0] == "python-betterproto":
+            return _fake_run(stdout="0.0.1")
+        return _EMPTY_RUN
 
-    monkeypatch.setattr(subprocess, "run", fake_run)  # type: ignore[attr-defined]
+    patch_run(fake_run)
     ver = detect_plugin_version()
+    # Candidates are probed concurrently but the earliest one wins
     assert ver == "1.9.0"
-    # Ensure we didn't need to try later candidates after success
-    assert calls[0][0] == "protoc-gen-python_betterproto"
+    assert "protoc-gen-python_betterproto" in [cmd[0] for cmd in calls]
+
+
+def test_detect_versions_are_cached(patch_run: _PatchRun):
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_: Any):
+        calls.append(cmd)
+        return _fake_run(stdout="1.2.3")
 
+    patch_run(fake_run)
+    assert detect_buf_version() == detect_buf_version() == "1.2.3"
+    assert calls == [["buf", "--version"]]
 
-def test_detect_plugin_version_all_missing(monkeypatch: pytest.MonkeyPatch):
-    import subprocess
 
+def test_detect_plugin_version_all_missing(patch_run: _PatchRun):
     def fake_run(*_: Any, **__: Any):
         raise FileNotFoundError
 
-    monkeypatch.setattr(subprocess, "run", fake_run)  # type: ignore[attr-defined]
+    patch_run(fake_run)
+    assert detect_plugin_version() is None
+
+
+def test_detect_plugin_version_skips_binaries_not_on_path(
+    patch_run: _PatchRun, monkeypatch: pytest.MonkeyPatch
+):
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_: Any):
+        calls.append(cmd)
+        return _fake_run(stdout="2.0.0")
+
+    patch_run(fake_run)
+    on_path = {"python-betterproto"}
+    monkeypatch.setattr(
+        "getbuf.version.shutil.which",
+        lambda name: f"/usr/bin/{name}" if name in on_path else None,
+    )
+    assert detect_plugin_version() == "2.0.0"
+    assert calls == [["python-betterproto", "--version"]]
+
+    # Nothing on PATH: no process is spawned at all
+    detect_plugin_version.cache_clear()
+    calls.clear()
+    on_path.clear()
     assert detect_plugin_version() is None
+    assert calls == []
 
 
 def test_version_info_aggregation(monkeypatch: pytest.MonkeyPatch):